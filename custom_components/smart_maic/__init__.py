@@ -4,35 +4,86 @@ from __future__ import annotations
 
 import logging
 import asyncio
+from functools import partial
 
 from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.util.json import json_loads_object
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .smart_maic import SmartMaic
 from .coordinator import SmartMaicCoordinator
+from .counters import STORAGE_VERSION, storage_key
+from .services import async_setup_services
+from .site import SmartMaicAggregator, SmartMaicSite, entry_tags
+from .store import SmartMaicStore
 from .const import (
+    DATA_AGGREGATOR,
     DEVICE_ID,
     DOMAIN,
+    ENTRY_TYPE,
+    ENTRY_TYPE_SITE,
     PREFIX,
 )
 
-PLATFORMS = [Platform.SENSOR, Platform.NUMBER, Platform.SWITCH]
+SITE_PLATFORMS = [Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def supported_platforms(data: SmartMaicStore) -> list[Platform]:
+    """Return platforms supported by the device payload."""
+    keys = data.seen_keys()
+    platforms = [Platform.SENSOR]
+    if any(key.startswith("Wh") for key in keys):
+        platforms.append(Platform.NUMBER)
+    if "OUT" in keys:
+        platforms.append(Platform.SWITCH)
+    return platforms
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up Smart MAIC services and site aggregation."""
+    aggregator = hass.data[DATA_AGGREGATOR] = SmartMaicAggregator(hass)
+    await aggregator.async_load(
+        entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+    async_setup_services(hass)
+    return True
+
+
 async def update_listener(hass, entry):
     """Handle options update."""
     coordinator: SmartMaicCoordinator = hass.data[DOMAIN][entry.entry_id]
     coordinator.set_update_interval()
+    # NOTE: changed tags may move the device in or out of sites
+    hass.data[DATA_AGGREGATOR].async_notify_devices()
+    await coordinator.async_update_subscriptions()
+
+
+async def async_setup_site_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Smart MAIC site from a config entry."""
+    aggregator: SmartMaicAggregator = hass.data[DATA_AGGREGATOR]
+    site = SmartMaicSite(hass, entry, aggregator.site_energy(entry.entry_id))
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = site
+    entry.async_on_unload(aggregator.async_add_site(entry.entry_id, site))
+
+    await hass.config_entries.async_forward_entry_setups(entry, SITE_PLATFORMS)
+
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Smart MAIC from a config entry."""
+    if entry.data.get(ENTRY_TYPE) == ENTRY_TYPE_SITE:
+        return await async_setup_site_entry(hass, entry)
+
     if not await mqtt.async_wait_for_mqtt_client(hass):
         raise ConfigEntryNotReady("MQTT is not available")
 
@@ -40,40 +91,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator = SmartMaicCoordinator(smart_maic, hass)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
-    json_received = False
-
     async def wait_for_json() -> None:
-        while not json_received:
+        while not coordinator.data:
             await asyncio.sleep(5)
             _LOGGER.debug("Has no JSON")
 
-    @callback
-    def async_json_received(msg: mqtt.ReceiveMessage) -> None:
-        nonlocal json_received
-        json_received = True
-
-        data = json_loads_object(msg.payload)
-        _LOGGER.debug(f"MQTT data: {data}")
-        coordinator.async_set_updated_data(data)
-
-    topic = "/".join([PREFIX, entry.data[DEVICE_ID], "JSON"])
-    _LOGGER.debug(f"Listening for MQTT topic: {topic}")
-    entry.async_on_unload(await mqtt.async_subscribe(hass, topic, async_json_received))
-    non_prefixed_topic = "/".join([entry.data[DEVICE_ID], "JSON"])
-    _LOGGER.debug(f"Listening for non-prefixed MQTT topic: {non_prefixed_topic}")
+    await coordinator.counters.async_load()
     entry.async_on_unload(
-        await mqtt.async_subscribe(hass, non_prefixed_topic, async_json_received)
+        coordinator.async_add_sample_listener(coordinator.counters.async_update)
     )
 
+    entry.async_on_unload(coordinator.async_unsubscribe)
+    await coordinator.async_update_subscriptions()
+
+    topic = "/".join([PREFIX, entry.data[DEVICE_ID], "JSON"])
     try:
         async with hass.timeout.async_timeout(90):
             await wait_for_json()
     except asyncio.TimeoutError as ex:
+        hass.data[DOMAIN].pop(entry.entry_id)
         raise ConfigEntryNotReady(f"Timeout waiting for MQTT topic {topic}") from ex
 
     _LOGGER.debug("Has JSON!")
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    aggregator: SmartMaicAggregator = hass.data[DATA_AGGREGATOR]
+
+    @callback
+    def async_update_site() -> None:
+        if coordinator.replaying:
+            return
+        aggregator.async_update_device(
+            entry.entry_id, entry_tags(entry), coordinator.site_contribution()
+        )
+
+    entry.async_on_unload(coordinator.async_add_listener(async_update_site))
+    entry.async_on_unload(partial(aggregator.async_unload_device, entry.entry_id))
+    entry.async_on_unload(
+        aggregator.async_add_device_listener(
+            entry.entry_id,
+            partial(entry_tags, entry),
+            coordinator.async_set_site_tracking,
+        )
+    )
+    async_update_site()
+
+    coordinator.platforms = supported_platforms(coordinator.data)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
@@ -81,8 +144,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if entry.data.get(ENTRY_TYPE) == ENTRY_TYPE_SITE:
+        unload_ok = await hass.config_entries.async_unload_platforms(
+            entry, SITE_PLATFORMS
+        )
+        if unload_ok:
+            hass.data[DOMAIN].pop(entry.entry_id)
+        return unload_ok
+
+    coordinator: SmartMaicCoordinator = hass.data[DOMAIN][entry.entry_id]
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
+    )
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data stored for a config entry."""
+    if aggregator := hass.data.get(DATA_AGGREGATOR):
+        aggregator.async_remove_entry(entry.entry_id)
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
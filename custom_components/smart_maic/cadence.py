@@ -0,0 +1,131 @@
+"""Publish cadence estimation for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+from time import monotonic
+
+# NOTE: messages closer than this belong to the same publish,
+# e.g. separate metric topics or a burst of queued messages
+MIN_INTERVAL = 1.0
+MIN_SAMPLES = 10
+PERCENTILE = 0.95
+SAFETY_FACTOR = 2.0
+# NOTE: intervals off by more than this factor suggest a changed cadence
+OUTLIER_FACTOR = 2.0
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P² algorithm.
+
+    Keeps five markers regardless of the number of observations,
+    see Jain & Chlamtac, "The P² algorithm for dynamic calculation
+    of quantiles and histograms without storing observations".
+    """
+
+    def __init__(self, p: float) -> None:
+        """Init P² estimator for quantile p."""
+        self._p = p
+        self._heights: list[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        """Add an observation."""
+        self.count += 1
+        q = self._heights
+
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Return piecewise-parabolic prediction of a marker height."""
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float | None:
+        """Return the current quantile estimate."""
+        q = self._heights
+        if not q:
+            return None
+        if len(q) < 5:
+            return q[min(len(q) - 1, int(self._p * len(q)))]
+        return q[2]
+
+
+class SmartMaicCadence:
+    """Learn device publish interval and derive data expiration from it.
+
+    Intervals far from the estimate, like gaps of an outage, are held back.
+    Once MIN_SAMPLES of them come in a row, the device switched to another
+    publish interval, and the estimate restarts from the held ones.
+    """
+
+    def __init__(self) -> None:
+        """Init Smart MAIC cadence."""
+        self._quantile = P2Quantile(PERCENTILE)
+        self._last_at: float | None = None
+        self._outliers: list[float] = []
+
+    def add_arrival(self) -> None:
+        """Note a message arrival."""
+        now = monotonic()
+        if self._last_at is not None:
+            if (interval := now - self._last_at) < MIN_INTERVAL:
+                return
+            self._add_interval(interval)
+        self._last_at = now
+
+    def _add_interval(self, interval: float) -> None:
+        """Add an interval unless it is an outlier of the learned cadence."""
+        if self._quantile.count >= MIN_SAMPLES:
+            estimate = self._quantile.value
+            if not estimate / OUTLIER_FACTOR <= interval <= estimate * OUTLIER_FACTOR:
+                self._outliers.append(interval)
+                if len(self._outliers) < MIN_SAMPLES:
+                    return
+                self._quantile = P2Quantile(PERCENTILE)
+                for outlier in self._outliers[:-1]:
+                    self._quantile.add(outlier)
+            self._outliers.clear()
+        self._quantile.add(interval)
+
+    @property
+    def expiration(self) -> float | None:
+        """Return learned expiration in seconds or None if not learned yet."""
+        if self._quantile.count < MIN_SAMPLES:
+            return None
+        return self._quantile.value * SAFETY_FACTOR
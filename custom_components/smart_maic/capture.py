@@ -0,0 +1,125 @@
+"""Capture and replay of MQTT payloads for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import os
+from time import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_DELAY = 5
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024
+
+
+def capture_path(hass: HomeAssistant, filename: str) -> str:
+    """Return path of a capture file, restricted to the capture directory."""
+    return hass.config.path(DOMAIN, os.path.basename(filename))
+
+
+class SmartMaicCapture:
+    """Append-only capture of timestamped payloads with size-bound rotation.
+
+    Each line is a UNIX timestamp and a payload separated by a tab. Lines are
+    buffered and written in the executor. Once the file exceeds the maximum
+    size it is moved to "<path>.1", replacing the previous one.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, max_size: int) -> None:
+        """Init Smart MAIC capture."""
+        self.hass = hass
+        self.path = path
+        self._max_size = max_size
+        self._lines: list[str] = []
+        self._flush_unsub: Callable[[], None] | None = None
+        self._write_lock = asyncio.Lock()
+
+    @callback
+    def async_write(self, payload: str) -> None:
+        """Buffer a payload to be written."""
+        payload = payload.replace("\n", " ")
+        self._lines.append(f"{time():.3f}\t{payload}\n")
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self.hass, FLUSH_DELAY, self._async_flush_later
+            )
+
+    @callback
+    def _async_flush_later(self, _now: datetime) -> None:
+        """Flush buffered payloads."""
+        self._flush_unsub = None
+        self.hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write buffered payloads."""
+        lines, self._lines = self._lines, []
+        if lines:
+            async with self._write_lock:
+                await self.hass.async_add_executor_job(self._write, lines)
+
+    async def async_stop(self) -> None:
+        """Stop capture and write buffered payloads."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+        await self.async_flush()
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines and rotate the file when it is too big."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+            size = file.tell()
+        if size >= self._max_size:
+            _LOGGER.debug(f"Rotating capture {self.path}")
+            os.replace(self.path, f"{self.path}.1")
+
+
+def read_capture(path: str) -> list[tuple[float, str]] | None:
+    """Read timestamped payloads of a capture, including its rotated part.
+
+    Return None if the capture does not exist.
+    """
+    parts = [part for part in [f"{path}.1", path] if os.path.exists(part)]
+    if not parts:
+        return None
+
+    records = []
+    for part in parts:
+        with open(part, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                timestamp, _, payload = line.rstrip("\n").partition("\t")
+                try:
+                    records.append((float(timestamp), payload))
+                except ValueError:
+                    _LOGGER.warning(f"Skipping malformed line {number} of {part}")
+    return records
+
+
+async def async_replay(
+    records: list[tuple[float, str]],
+    speed: float,
+    payload_callback: Callable[[str], None],
+) -> None:
+    """Feed captured payloads at the captured pace divided by speed.
+
+    Speed of 0 feeds payloads without delays.
+    """
+    _LOGGER.debug(f"Replaying {len(records)} payloads")
+
+    previous: float | None = None
+    for timestamp, payload in records:
+        if speed and previous is not None and timestamp > previous:
+            await asyncio.sleep((timestamp - previous) / speed)
+        else:
+            await asyncio.sleep(0)
+        previous = timestamp
+        payload_callback(payload)
@@ -14,14 +14,24 @@ from homeassistant.data_entry_flow import AbortFlow
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
+    ADAPTIVE_EXPIRATION,
+    COALESCE_WINDOW,
+    DEFAULT_COALESCE_WINDOW,
     DEFAULT_EXPIRATION,
     DEVICE_ID,
     DEVICE_NAME,
     DEVICE_TYPE,
     DOMAIN,
+    ENTITY_UPDATES,
+    ENTRY_TYPE,
+    ENTRY_TYPE_SITE,
     EXPIRATION,
+    FIRE_EVENTS,
     IP_ADDRESS,
+    PER_METRIC_TOPICS,
     PIN,
+    TAG,
+    TAGS,
 )
 from .smart_maic import SmartMaic
 from .coordinator import SmartMaicCoordinator
@@ -36,11 +46,26 @@ USER_SCHEMA = vol.Schema(
     }
 )
 
+SITE_SCHEMA = vol.Schema(
+    {
+        vol.Required(DEVICE_NAME, default="Site"): cv.string,
+        vol.Optional(TAG): cv.string,
+    }
+)
+
 OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Optional(EXPIRATION, default=DEFAULT_EXPIRATION): vol.All(
             vol.Coerce(int), vol.Range(min=5)
         ),
+        vol.Optional(ADAPTIVE_EXPIRATION, default=False): cv.boolean,
+        vol.Optional(PER_METRIC_TOPICS, default=False): cv.boolean,
+        vol.Optional(COALESCE_WINDOW, default=DEFAULT_COALESCE_WINDOW): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(FIRE_EVENTS, default=False): cv.boolean,
+        vol.Optional(ENTITY_UPDATES, default=True): cv.boolean,
+        vol.Optional(TAGS, default=""): cv.string,
     }
 )
 
@@ -82,11 +107,37 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Create the options flow."""
         return OptionsFlowHandler()
 
+    @classmethod
+    @callback
+    def async_supports_options_flow(
+        cls, config_entry: config_entries.ConfigEntry
+    ) -> bool:
+        """Return options flow support for device entries only."""
+        return config_entry.data.get(ENTRY_TYPE) != ENTRY_TYPE_SITE
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["device", "site"])
+
+    async def async_step_site(self, user_input=None):
+        """Handle the site step."""
+        if user_input is None:
+            return self.async_show_form(step_id="site", data_schema=SITE_SCHEMA)
+
+        tag = user_input.get(TAG) or ""
+        await self.async_set_unique_id(f"{ENTRY_TYPE_SITE}-{tag}")
+        self._abort_if_unique_id_configured()
+
+        return self.async_create_entry(
+            title=user_input[DEVICE_NAME],
+            data=user_input | {ENTRY_TYPE: ENTRY_TYPE_SITE},
+        )
+
+    async def async_step_device(self, user_input=None):
+        """Handle the device step."""
         if user_input is None:
             return self.async_show_form(
-                step_id="user", data_schema=USER_SCHEMA, errors={}
+                step_id="device", data_schema=USER_SCHEMA, errors={}
             )
 
         errors = {}
@@ -109,7 +160,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         data_schema = self.add_suggested_values_to_schema(USER_SCHEMA, user_input)
         return self.async_show_form(
-            step_id="user", data_schema=data_schema, errors=errors
+            step_id="device", data_schema=data_schema, errors=errors
         )
 
 
@@ -5,11 +5,31 @@ from homeassistant.const import CONF_IP_ADDRESS, CONF_PIN
 DOMAIN = "smart_maic"
 PREFIX = "smart-maic"
 HTTP_TIMEOUT = 5
+CACHE_TTL = 30
 DEFAULT_EXPIRATION = 90
+DEFAULT_COALESCE_WINDOW = 1
+EVENT_DATA = f"{DOMAIN}_data"
+DATA_AGGREGATOR = f"{DOMAIN}_aggregator"
 
 IP_ADDRESS = CONF_IP_ADDRESS
 PIN = CONF_PIN
 DEVICE_NAME = "device_name"
 DEVICE_ID = "devid"
 DEVICE_TYPE = "devtype"
+ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_SITE = "site"
+TAG = "tag"
+TAGS = "tags"
 EXPIRATION = "expiration"
+ADAPTIVE_EXPIRATION = "adaptive_expiration"
+PER_METRIC_TOPICS = "per_metric_topics"
+COALESCE_WINDOW = "coalesce_window"
+FIRE_EVENTS = "fire_events"
+ENTITY_UPDATES = "entity_updates"
+
+SERVICE_GET_CONFIG = "get_config"
+SERVICE_GET_WDATA = "get_wdata"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_START_REPLAY = "start_replay"
+SERVICE_STOP_REPLAY = "stop_replay"
@@ -2,33 +2,83 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable
+from contextlib import suppress
 from datetime import timedelta, datetime
 import logging
+import math
+from time import monotonic
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components import mqtt
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.redact import REDACTED
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util.dt import utcnow
+from homeassistant.util.json import json_loads, json_loads_object
 
+from .cadence import SmartMaicCadence
+from .capture import SmartMaicCapture, async_replay
+from .counters import COUNTER_KEYS, SmartMaicCounters
+from .site import CONTRIBUTION_KEYS
 from .smart_maic import SmartMaic
+from .store import SmartMaicStore, to_float, to_number
 from .const import (
+    ADAPTIVE_EXPIRATION,
+    CACHE_TTL,
+    COALESCE_WINDOW,
+    DEFAULT_COALESCE_WINDOW,
     DEFAULT_EXPIRATION,
+    DEVICE_ID,
+    DEVICE_TYPE,
     DOMAIN,
+    EVENT_DATA,
     EXPIRATION,
+    FIRE_EVENTS,
+    PER_METRIC_TOPICS,
+    PREFIX,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+PHASE_TOTAL_KEYS = ["A", "W", "rW", "Wh", "rWh"]
+# NOTE: parts of config keys holding credentials, e.g. MQTT "uname" and "pass"
+SECRET_KEYS = ["pass", "pin", "uname", "token"]
 
-class SmartMaicCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class SmartMaicCoordinator(DataUpdateCoordinator[SmartMaicStore]):
     """Smart MAIC Coordinator class."""
 
     _smart_maic: SmartMaic | None = None
+    _store: SmartMaicStore | None = None
+    counters: SmartMaicCounters | None = None
+    capture: SmartMaicCapture | None = None
+    _replay_task: asyncio.Task[None] | None = None
+    replaying = False
+    platforms: list[Platform] = []
     _last_update_at: datetime | None = None
 
     def __init__(self, smart_maic: SmartMaic, hass: HomeAssistant) -> None:
         """Initialize."""
         self._smart_maic = smart_maic
+        self._cadence = SmartMaicCadence()
+        self._tracked_keys: Counter[str] = Counter()
+        self._subscriptions: dict[str, Callable[[], None]] = {}
+        self._subscriptions_lock = asyncio.Lock()
+        self._sample_listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._untrack_site: Callable[[], None] | None = None
+        self._pending_data: dict[str, Any] | None = None
+        self._pending_values: dict[str, Any] = {}
+        self._payload: dict[str, Any] = {}
+        self._coalesce_unsub: Callable[[], None] | None = None
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._cache_generation = 0
+        self._requests: dict[str, asyncio.Task[dict[str, Any]]] = {}
 
         super().__init__(
             hass,
@@ -36,25 +86,357 @@ class SmartMaicCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             name=DOMAIN,
         )
 
+        self._subscriptions_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=1,
+            immediate=False,
+            function=self.async_update_subscriptions,
+        )
+
         if self.config_entry:
             self.set_update_interval()
+            self.counters = SmartMaicCounters(hass, self.config_entry.entry_id)
 
     def set_update_interval(self):
         """Set update interval."""
-        self.update_interval = timedelta(
-            seconds=self.config_entry.options.get(EXPIRATION) or DEFAULT_EXPIRATION
-        )
+        expiration = self.config_entry.options.get(EXPIRATION) or DEFAULT_EXPIRATION
+        if self.config_entry.options.get(ADAPTIVE_EXPIRATION) and (
+            learned := self._cadence.expiration
+        ):
+            expiration = learned
+        self.update_interval = timedelta(seconds=expiration)
+
+    def async_set_value(self, key: str, value: Any):
+        """Set a single value and notify listeners."""
+        self._pending_values[key] = value
+        self._async_flush()
+
+    @callback
+    def async_add_sample_listener(
+        self, sample_callback: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Listen for every received sample, including coalesced ones."""
+        self._sample_listeners.append(sample_callback)
+
+        @callback
+        def remove_sample_listener() -> None:
+            # NOTE: listeners are already dropped if the coordinator is shut down
+            if sample_callback in self._sample_listeners:
+                self._sample_listeners.remove(sample_callback)
 
-    def async_set_updated_data(self, data: dict[str, Any]):
-        """Set updated data and note the time."""
-        super().async_set_updated_data(data)
+        return remove_sample_listener
+
+    @callback
+    def async_json_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Handle JSON payload with all metrics."""
+        if self.capture:
+            self.capture.async_write(msg.payload)
+        self.async_json_payload_received(msg.payload)
+
+    @callback
+    def async_json_payload_received(self, payload: str) -> None:
+        """Handle JSON payload received from MQTT."""
+        data = json_loads_object(payload)
+        _LOGGER.debug(f"MQTT data: {data}")
+        # NOTE: the snapshot is newer than metric values received before it
+        self._pending_data = data
+        self._pending_values = {}
+        self._async_received(data)
+
+    @callback
+    def async_replay_payload_received(self, payload: str) -> None:
+        """Handle JSON payload replayed from a capture.
+
+        Replayed data is only shown by entities, it is not fed to counters,
+        cadence, site totals or events.
+        """
+        try:
+            data = json_loads_object(payload)
+        except ValueError:
+            _LOGGER.warning(f"Skipping malformed replayed payload: {payload}")
+            return
         self._last_update_at = utcnow().replace(microsecond=0)
+        self._pending_data = data
+        self._pending_values = {}
+        self._async_coalesce()
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Check for stale data and reset it or return the latest data."""
-        return await self.hass.async_add_executor_job(self._update_data)
+    @callback
+    def async_metric_received(self, msg: mqtt.ReceiveMessage) -> None:
+        """Handle payload of a single metric topic."""
+        key = msg.topic.rsplit("/", 1)[-1]
+        value = parse_metric(msg.payload)
+        _LOGGER.debug(f"MQTT metric: {key}={value}")
+        self._pending_values[key] = value
+        self._async_received({key: value})
+
+    @callback
+    def _async_received(self, data: dict[str, Any]) -> None:
+        """Feed a received sample to listeners and apply it when possible."""
+        self._last_update_at = utcnow().replace(microsecond=0)
+        self._cadence.add_arrival()
+        if self.config_entry.options.get(ADAPTIVE_EXPIRATION):
+            self.set_update_interval()
+        for sample_callback in list(self._sample_listeners):
+            sample_callback(data)
+        self._async_coalesce()
+
+    @callback
+    def _async_coalesce(self) -> None:
+        """Apply pending data unless a coalescing window is open."""
+        if self._coalesce_unsub is not None:
+            return
+        if self._pending_data is None and not self._pending_values:
+            return
+
+        self._async_flush()
+
+        if window := self.config_entry.options.get(
+            COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+        ):
+            self._coalesce_unsub = async_call_later(
+                self.hass, window, self._async_coalesce_window_closed
+            )
+
+    @callback
+    def _async_coalesce_window_closed(self, _now: datetime) -> None:
+        """Apply the latest data received during the window."""
+        self._coalesce_unsub = None
+        self._async_coalesce()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Apply pending data to the store and notify listeners once."""
+        data, self._pending_data = self._pending_data, None
+        values, self._pending_values = self._pending_values, {}
+
+        if data is not None:
+            if self._store is None:
+                self._store = SmartMaicStore()
+            self._store.update(data)
+            self._payload = data
+
+        if self._store is None:
+            return
+
+        for key, value in values.items():
+            self._store.set(key, value)
+        if values:
+            self._payload = self._payload | values
+
+        self.async_set_updated_data(self._store)
+
+        if self.config_entry.options.get(FIRE_EVENTS):
+            self._async_fire_event()
+
+    def counter_value(self, key: str, raw: float | int) -> float | int | None:
+        """Return corrected value of an energy counter.
+
+        Replayed counters are not tracked and may be lower than live ones,
+        which statistics would count as a meter reset, so the last live value
+        is kept while replaying.
+        """
+        if self.replaying:
+            return self.counters.total(key)
+        return self.counters.corrected(key, raw)
+
+    def site_contribution(self) -> dict[str, float]:
+        """Return values the device contributes to site totals."""
+        contribution: dict[str, float] = {}
+        data = self.data
+
+        if data:
+            # NOTE: total current of single-phase device like D101 is "A"
+            for key in ["W", "rW", "A"]:
+                values = [data.get(f"{key}{index}") for index in ["1", "2", "3"]]
+                if key in data:
+                    contribution[key] = data[key]
+                elif None not in values:
+                    contribution[key] = sum(values)
+            for key in ["A1", "A2", "A3"]:
+                if key in data:
+                    contribution[key] = data[key]
+
+        # NOTE: energy is kept while data is expired to avoid drops of site total
+        if (energy := self.counters.total("Wh")) is None:
+            totals = [self.counters.total(f"Wh{index}") for index in ["1", "2", "3"]]
+            if totals := [total for total in totals if total is not None]:
+                energy = sum(totals)
+        if energy is not None:
+            contribution["Wh"] = energy
+
+        return contribution
+
+    @callback
+    def _async_fire_event(self) -> None:
+        """Fire an event with the latest payload of the device."""
+        if self.replaying:
+            return
+
+        data = self._payload
+        derived = {}
 
-    def _update_data(self) -> dict[str, Any]:
+        # NOTE: sum phases of 3-phase device like D103
+        for key in PHASE_TOTAL_KEYS:
+            values = [to_float(data.get(f"{key}{index}")) for index in ["1", "2", "3"]]
+            if not any(math.isnan(value) for value in values):
+                derived[key] = to_number(sum(values))
+
+        self.hass.bus.async_fire(
+            EVENT_DATA,
+            {
+                DEVICE_ID: self.config_entry.data[DEVICE_ID],
+                DEVICE_TYPE: self.config_entry.data[DEVICE_TYPE],
+                "data": data,
+                "derived": derived,
+            },
+        )
+
+    @callback
+    def async_track_keys(self, keys: Iterable[str]) -> Callable[[], None]:
+        """Track metric keys consumed by an entity."""
+        keys = list(keys)
+        self._tracked_keys.update(keys)
+        self._subscriptions_debouncer.async_schedule_call()
+
+        @callback
+        def untrack() -> None:
+            self._tracked_keys.subtract(keys)
+            self._tracked_keys += Counter()
+            self._subscriptions_debouncer.async_schedule_call()
+
+        return untrack
+
+    @callback
+    def async_set_site_tracking(self, tracked: bool) -> None:
+        """Track keys summed up by sites while a site includes the device."""
+        if tracked and self._untrack_site is None:
+            self._untrack_site = self.async_track_keys(CONTRIBUTION_KEYS)
+        elif not tracked and self._untrack_site is not None:
+            self._untrack_site()
+            self._untrack_site = None
+
+    async def async_update_subscriptions(self) -> None:
+        """Subscribe to JSON topic or to topics of tracked metrics only."""
+        devid = self.config_entry.data[DEVICE_ID]
+        if self._store is not None and self.config_entry.options.get(PER_METRIC_TOPICS):
+            seen = self._store.seen_keys()
+            # NOTE: counters keep energy monotonic even without entities
+            keys = [
+                key for key in seen if key in self._tracked_keys or key in COUNTER_KEYS
+            ]
+            # NOTE: values of keys without a topic would never be updated again
+            self._store.retain(keys)
+            self._payload = {
+                key: value for key, value in self._payload.items() if key in keys
+            }
+            handler = self.async_metric_received
+        else:
+            keys = ["JSON"]
+            handler = self.async_json_received
+
+        # NOTE: subscribe to both prefixed and non-prefixed topics
+        wanted = {
+            "/".join([*prefix, devid, key]): handler
+            for key in keys
+            for prefix in [[PREFIX], []]
+        }
+        if self.replaying:
+            wanted = {}
+
+        async with self._subscriptions_lock:
+            for topic in set(self._subscriptions) - set(wanted):
+                _LOGGER.debug(f"Unsubscribing from MQTT topic: {topic}")
+                self._subscriptions.pop(topic)()
+
+            for topic, msg_callback in wanted.items():
+                if topic not in self._subscriptions:
+                    _LOGGER.debug(f"Listening for MQTT topic: {topic}")
+                    self._subscriptions[topic] = await mqtt.async_subscribe(
+                        self.hass, topic, msg_callback
+                    )
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Unsubscribe from all MQTT topics and drop pending data."""
+        self._subscriptions_debouncer.async_cancel()
+        if self._coalesce_unsub is not None:
+            self._coalesce_unsub()
+            self._coalesce_unsub = None
+        self._pending_data = None
+        self._pending_values = {}
+        for unsubscribe in self._subscriptions.values():
+            unsubscribe()
+        self._subscriptions.clear()
+
+    async def async_start_capture(self, path: str, max_size: int) -> None:
+        """Start capturing JSON payloads to a file."""
+        await self.async_stop_capture()
+        self.capture = SmartMaicCapture(self.hass, path, max_size)
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing JSON payloads."""
+        if self.capture:
+            capture, self.capture = self.capture, None
+            await capture.async_stop()
+
+    async def async_start_replay(
+        self, records: list[tuple[float, str]], speed: float
+    ) -> None:
+        """Start feeding captured JSON payloads in the background.
+
+        MQTT topics are unsubscribed until the replay ends, then the replayed
+        data is dropped.
+        """
+        await self.async_stop_replay()
+        self.replaying = True
+        await self.async_update_subscriptions()
+        self._replay_task = self.hass.async_create_background_task(
+            self._async_replay(records, speed), f"{DOMAIN} replay"
+        )
+
+    async def _async_replay(
+        self, records: list[tuple[float, str]], speed: float
+    ) -> None:
+        """Replay payloads and return to live data."""
+        try:
+            await async_replay(records, speed, self.async_replay_payload_received)
+        finally:
+            self.replaying = False
+            if self._coalesce_unsub is not None:
+                self._coalesce_unsub()
+                self._coalesce_unsub = None
+            self._pending_data = None
+            self._pending_values = {}
+            self._payload = {}
+            if self._store is not None:
+                self._store.clear()
+                self.async_update_listeners()
+            self._subscriptions_debouncer.async_schedule_call()
+
+    async def async_stop_replay(self) -> None:
+        """Stop feeding captured JSON payloads."""
+        if self._replay_task:
+            task, self._replay_task = self._replay_task, None
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending work and drop references held by the coordinator."""
+        await super().async_shutdown()
+        # NOTE: no resubscribing once keys are untracked after unload
+        self._subscriptions_debouncer.async_shutdown()
+        self._untrack_site = None
+        await self.async_stop_replay()
+        await self.async_stop_capture()
+        self.async_unsubscribe()
+        self._sample_listeners.clear()
+        self._tracked_keys.clear()
+        if self.counters:
+            await self.counters.async_save()
+
+    async def _async_update_data(self) -> SmartMaicStore:
         """Check for stale data and reset it or return the latest data."""
         _LOGGER.debug(f"Last data update: {self._last_update_at}")
 
@@ -65,25 +447,84 @@ class SmartMaicCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             >= self.update_interval
         ):
             _LOGGER.debug("Data expired")
-            self.data = {}
+            self.data.clear()
+            self._payload = {}
+            if self.config_entry.options.get(FIRE_EVENTS):
+                self._async_fire_event()
 
         return self.data
 
-    def _get_config(self) -> None:
+    def _get_config(self) -> dict[str, Any]:
         """Get Smart MAIC config."""
-        return self._smart_maic.set_mqtt_config()
+        return self._smart_maic.get_config()
 
-    async def async_get_config(self) -> None:
+    async def async_get_config(self) -> dict[str, Any]:
         """Get Smart MAIC config."""
         return await self.hass.async_add_executor_job(self._get_config)
 
-    def _set_mqtt_config(self) -> None:
+    def _get_redacted_config(self) -> dict[str, Any]:
+        """Get Smart MAIC config without credentials."""
+        return redact_secrets(self._smart_maic.get_config())
+
+    async def async_get_cached_config(self) -> dict[str, Any]:
+        """Get Smart MAIC config without credentials from cache or the device."""
+        return await self._async_get_cached("config", self._get_redacted_config)
+
+    def _get_wdata(self) -> dict[str, Any]:
+        """Get Smart MAIC "wdata"."""
+        return self._smart_maic.get_wdata()
+
+    async def async_get_cached_wdata(self) -> dict[str, Any]:
+        """Get Smart MAIC "wdata" from cache or the device."""
+        return await self._async_get_cached("wdata", self._get_wdata)
+
+    async def _async_get_cached(
+        self, key: str, job: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Get cached data or share a single in-flight request to the device."""
+        cached = self._cache.get(key)
+        if cached and monotonic() - cached[0] < CACHE_TTL:
+            return cached[1]
+
+        if (request := self._requests.get(key)) is None:
+            request = self._requests[key] = self.hass.async_create_task(
+                self._async_request(key, job, self._cache_generation)
+            )
+
+        return await asyncio.shield(request)
+
+    async def _async_request(
+        self, key: str, job: Callable[[], dict[str, Any]], generation: int
+    ) -> dict[str, Any]:
+        """Request data from the device and cache it unless invalidated."""
+        try:
+            data = await self.hass.async_add_executor_job(job)
+        finally:
+            if generation == self._cache_generation:
+                self._requests.pop(key, None)
+
+        if generation == self._cache_generation:
+            self._cache[key] = (monotonic(), data)
+
+        return data
+
+    @callback
+    def async_invalidate_cache(self) -> None:
+        """Drop cached and in-flight data after the device state was changed."""
+        self._cache_generation += 1
+        self._cache.clear()
+        self._requests.clear()
+
+    def _set_mqtt_config(self) -> dict[str, Any]:
         """Set Smart MAIC MQTT config."""
         return self._smart_maic.set_mqtt_config()
 
-    async def async_set_mqtt_config(self) -> None:
+    async def async_set_mqtt_config(self) -> dict[str, Any]:
         """Set Smart MAIC MQTT config."""
-        return await self.hass.async_add_executor_job(self._set_mqtt_config)
+        try:
+            return await self.hass.async_add_executor_job(self._set_mqtt_config)
+        finally:
+            self.async_invalidate_cache()
 
     def _set_consumption(self, key: str, value: float) -> None:
         """Set Smart MAIC consumption value."""
@@ -91,7 +532,12 @@ class SmartMaicCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_set_consumption(self, key: str, value: float) -> None:
         """Set Smart MAIC consumption value."""
-        return await self.hass.async_add_executor_job(self._set_consumption, key, value)
+        try:
+            return await self.hass.async_add_executor_job(
+                self._set_consumption, key, value
+            )
+        finally:
+            self.async_invalidate_cache()
 
     def _set_dry_switch(self, value: int) -> None:
         """Set Smart MAIC dry switch value."""
@@ -99,4 +545,31 @@ class SmartMaicCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_set_dry_switch(self, value: int) -> None:
         """Set Smart MAIC dry switch value."""
-        return await self.hass.async_add_executor_job(self._set_dry_switch, value)
+        try:
+            return await self.hass.async_add_executor_job(self._set_dry_switch, value)
+        finally:
+            self.async_invalidate_cache()
+
+
+def parse_metric(payload: str) -> Any:
+    """Return a metric payload decoded as JSON, or as is if not JSON."""
+    try:
+        return json_loads(payload)
+    except ValueError:
+        return payload
+
+
+def redact_secrets(data: Any) -> Any:
+    """Return data with values of credential keys redacted."""
+    if isinstance(data, dict):
+        return {
+            key: (
+                REDACTED
+                if any(secret in str(key).lower() for secret in SECRET_KEYS)
+                else redact_secrets(value)
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact_secrets(value) for value in data]
+    return data
@@ -0,0 +1,145 @@
+"""Energy counter integrity for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .store import to_float, to_number
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# NOTE: new counters and offsets are saved soon, last values periodically,
+# a delayed save rescheduled on every sample would never happen
+SAVE_DELAY = 1
+SAVE_INTERVAL = 60
+
+# NOTE: keys of TOTAL_INCREASING sensors
+COUNTER_KEYS = ["Wh", "Wh1", "Wh2", "Wh3"]
+
+
+class _Counter:
+    """State of a single energy counter."""
+
+    __slots__ = ("last", "offset", "drop")
+
+    def __init__(self, last: float, offset: float = 0.0) -> None:
+        """Init counter."""
+        self.last = last
+        self.offset = offset
+        self.drop: float | None = None
+
+
+class SmartMaicCounters:
+    """Keep energy counters monotonic across device resets and calibrations.
+
+    A drop below the last value is held until the next sample. If the next
+    sample recovers, the drop was spurious and is ignored. Otherwise the
+    counter was reset and an offset is added so that corrected values
+    continue from the last one.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Init Smart MAIC counters."""
+        self.hass = hass
+        self._counters: dict[str, _Counter] = {}
+        self._save_unsub: Callable[[], None] | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry_id)
+        )
+
+    async def async_load(self) -> None:
+        """Load counters state."""
+        if data := await self._store.async_load():
+            self._counters = {
+                key: _Counter(float(value["last"]), float(value["offset"]))
+                for key, value in data.items()
+            }
+
+    async def async_save(self) -> None:
+        """Save counters state."""
+        self._cancel_save()
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_update(self, data: dict[str, Any]) -> None:
+        """Track counters of a received sample."""
+        changed = False
+        for key in COUNTER_KEYS:
+            if key in data and not math.isnan(raw := to_float(data[key])):
+                changed |= self._update(key, raw)
+
+        if changed:
+            self._cancel_save()
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        elif self._save_unsub is None:
+            self._save_unsub = async_call_later(
+                self.hass, SAVE_INTERVAL, self._async_save_later
+            )
+
+    def _update(self, key: str, raw: float) -> bool:
+        """Track a counter value and return whether its offset changed."""
+        if (counter := self._counters.get(key)) is None:
+            self._counters[key] = _Counter(raw)
+            return True
+        if raw >= counter.last:
+            counter.last = raw
+            counter.drop = None
+        elif counter.drop is None:
+            counter.drop = raw
+        else:
+            _LOGGER.debug(f"Counter {key} reset from {counter.last} to {counter.drop}")
+            # NOTE: base on the lower sample so the corrected value never decreases
+            counter.offset += counter.last - min(counter.drop, raw)
+            counter.last = raw
+            counter.drop = None
+            return True
+        return False
+
+    @callback
+    def _async_save_later(self, _now: datetime) -> None:
+        """Save last values of counters."""
+        self._save_unsub = None
+        self._store.async_delay_save(self._data_to_save)
+
+    def _cancel_save(self) -> None:
+        """Cancel a pending periodic save."""
+        if self._save_unsub is not None:
+            self._save_unsub()
+            self._save_unsub = None
+
+    def corrected(self, key: str, raw: float | int) -> float | int:
+        """Return a corrected counter value for a raw one."""
+        if (counter := self._counters.get(key)) is None:
+            return raw
+        if counter.drop is not None and raw < counter.last:
+            return to_number(counter.last + counter.offset)
+        return to_number(raw + counter.offset)
+
+    def total(self, key: str) -> float | int | None:
+        """Return the last corrected value of a counter."""
+        if (counter := self._counters.get(key)) is None:
+            return None
+        return to_number(counter.last + counter.offset)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return data to save."""
+        return {
+            key: {"last": counter.last, "offset": counter.offset}
+            for key, counter in self._counters.items()
+        }
+
+
+def storage_key(entry_id: str) -> str:
+    """Return storage key of counters for a config entry."""
+    return f"{DOMAIN}.{entry_id}.counters"
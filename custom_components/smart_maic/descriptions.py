@@ -0,0 +1,186 @@
+"""Entity descriptions for the Smart MAIC integration.
+
+Descriptions of device platforms live here, so the state store layout is
+built from the same keys entities read.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from homeassistant.components.number import (
+    NumberDeviceClass,
+    NumberEntityDescription,
+    NumberMode,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.switch import SwitchEntityDescription
+from homeassistant.const import (
+    UnitOfTemperature,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfPower,
+)
+
+
+def phase_descriptions(index="") -> dict[str, SensorEntityDescription]:
+    """Generate entity descriptions for a given phase"""
+    return {
+        f"V{index}": SensorEntityDescription(
+            key=f"V{index}",
+            translation_key="voltage",
+            device_class=SensorDeviceClass.VOLTAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+            suggested_display_precision=2,
+        ),
+        f"A{index}": SensorEntityDescription(
+            key=f"A{index}",
+            translation_key="current",
+            device_class=SensorDeviceClass.CURRENT,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+            suggested_display_precision=2,
+        ),
+        f"W{index}": SensorEntityDescription(
+            key=f"W{index}",
+            translation_key="power",
+            device_class=SensorDeviceClass.POWER,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfPower.WATT,
+            suggested_display_precision=0,
+        ),
+        f"rW{index}": SensorEntityDescription(
+            key=f"rW{index}",
+            translation_key="return_power",
+            device_class=SensorDeviceClass.POWER,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfPower.WATT,
+            suggested_display_precision=0,
+            entity_registry_enabled_default=False,
+        ),
+        f"Wh{index}": SensorEntityDescription(
+            key=f"Wh{index}",
+            translation_key="consumption",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            suggested_display_precision=0,
+        ),
+        f"rWh{index}": SensorEntityDescription(
+            key=f"rWh{index}",
+            translation_key="return",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL,
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            suggested_display_precision=0,
+            entity_registry_enabled_default=False,
+        ),
+        f"PF{index}": SensorEntityDescription(
+            key=f"PF{index}",
+            translation_key="power_factor",
+            device_class=SensorDeviceClass.POWER_FACTOR,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+        ),
+    }
+
+
+def point_description(index) -> dict[str, SensorEntityDescription]:
+    """Generate entity description for a point"""
+    return {
+        f"T{index}": SensorEntityDescription(
+            key=f"T{index}",
+            translation_key="point",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    }
+
+
+def channel_description(index) -> dict[str, SensorEntityDescription]:
+    """Generate entity description for a channel"""
+    return {
+        f"Ch{index}": SensorEntityDescription(
+            key=f"Ch{index}",
+            translation_key="channel",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        f"TCh{index}": SensorEntityDescription(
+            key=f"TCh{index}",
+            translation_key="total_channel",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    }
+
+
+SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    # D101
+    **phase_descriptions(""),
+    # D103
+    **phase_descriptions("1"),
+    **phase_descriptions("2"),
+    **phase_descriptions("3"),
+    # D105
+    **point_description("1"),
+    **point_description("2"),
+    **point_description("3"),
+    **point_description("4"),
+    **point_description("5"),
+    **channel_description("1"),
+    **channel_description("2"),
+    "ADC": SensorEntityDescription(
+        key="ADC",
+        translation_key="adc",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # Common
+    "Temp": SensorEntityDescription(
+        key="Temp",
+        translation_key="device_temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=0,
+    ),
+}
+
+
+def number_phase_descriptions(index="") -> dict[str, NumberEntityDescription]:
+    """Generate entity descriptions for a given phase"""
+    return {
+        f"Wh{index}": NumberEntityDescription(
+            key=f"Wh{index}",
+            translation_key="consumption",
+            device_class=NumberDeviceClass.ENERGY,
+            mode=NumberMode.BOX,
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            native_min_value=0,
+            native_max_value=sys.maxsize,
+            entity_registry_enabled_default=False,
+        ),
+    }
+
+
+NUMBER_DESCRIPTIONS: dict[str, NumberEntityDescription] = {
+    **number_phase_descriptions(""),
+    **number_phase_descriptions("1"),
+    **number_phase_descriptions("2"),
+    **number_phase_descriptions("3"),
+}
+
+
+SWITCH_DESCRIPTIONS: dict[str, SwitchEntityDescription] = {
+    "OUT": SwitchEntityDescription(
+        key="OUT", translation_key="dry_switch", icon="mdi:home-switch"
+    ),
+}
+
+# NOTE: keys of all device entities define the fixed slot layout of the store
+STATE_KEYS: list[str] = list(
+    dict.fromkeys([*SENSOR_DESCRIPTIONS, *NUMBER_DESCRIPTIONS, *SWITCH_DESCRIPTIONS])
+)
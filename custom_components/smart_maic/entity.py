@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -13,9 +15,17 @@ from .const import (
     DEVICE_NAME,
     DEVICE_TYPE,
     DOMAIN,
+    ENTITY_UPDATES,
     IP_ADDRESS,
 )
 from .coordinator import SmartMaicCoordinator
+from .site import SmartMaicSite
+
+
+def _name_with_suffix(original: str, key: str) -> str:
+    """Return entity name with a phase or point suffix of the key."""
+    suffix = f" {key[-1]}" if key[-1] in ["1", "2", "3", "4", "5"] else ""
+    return f"{original}{suffix}"
 
 
 class SmartMaicEntity(CoordinatorEntity[SmartMaicCoordinator]):
@@ -37,6 +47,7 @@ class SmartMaicEntity(CoordinatorEntity[SmartMaicCoordinator]):
         self.entity_description = description
         self.hass = hass
         self._entry = entry
+        self._slot = coordinator.data.slot(description.key)
 
         self._attr_unique_id = "-".join(
             [
@@ -45,6 +56,22 @@ class SmartMaicEntity(CoordinatorEntity[SmartMaicCoordinator]):
             ]
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Track metrics consumed by the entity when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_track_keys(self.metric_keys))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state unless entity updates are turned off."""
+        if self._entry.options.get(ENTITY_UPDATES, True):
+            super()._handle_coordinator_update()
+
+    @property
+    def metric_keys(self) -> Iterable[str]:
+        """Return keys of the metrics consumed by the entity."""
+        return [self.entity_description.key]
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information about this Smart MAIC device."""
@@ -64,7 +91,49 @@ class SmartMaicEntity(CoordinatorEntity[SmartMaicCoordinator]):
     @property
     def name(self) -> str:
         """Return the name of the entity."""
-        original = super().name
-        key = self.entity_description.key
-        suffix = f" {key[-1]}" if key[-1] in ["1", "2", "3", "4", "5"] else ""
-        return f"{original}{suffix}"
+        return _name_with_suffix(super().name, self.entity_description.key)
+
+
+class SmartMaicSiteEntity(Entity):
+    """Defines a base Smart MAIC site entity."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        site: SmartMaicSite,
+        entry: ConfigEntry,
+        description: EntityDescription,
+    ) -> None:
+        """Initialize a Smart MAIC site entity."""
+        self.entity_description = description
+        self._site = site
+        self._entry = entry
+
+        self._attr_unique_id = "-".join([entry.entry_id, description.key])
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for site updates when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._site.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this Smart MAIC site."""
+        return DeviceInfo(
+            identifiers={
+                (
+                    DOMAIN,
+                    self._entry.entry_id,
+                )
+            },
+            name=self._entry.data[DEVICE_NAME],
+            manufacturer="Smart MAIC",
+            model="Site",
+        )
+
+    @property
+    def name(self) -> str:
+        """Return the name of the entity."""
+        return _name_with_suffix(super().name, self.entity_description.key)
@@ -5,17 +5,10 @@ The number component allows control of charging consumption.
 
 from __future__ import annotations
 
-import sys
 from typing import cast
 
-from homeassistant.components.number import (
-    NumberDeviceClass,
-    NumberEntity,
-    NumberEntityDescription,
-    NumberMode,
-)
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -23,33 +16,10 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import SmartMaicCoordinator
+from .descriptions import NUMBER_DESCRIPTIONS as ENTITY_DESCRIPTIONS
 from .entity import SmartMaicEntity
 
 
-def phase_descriptions(index="") -> dict[str, NumberEntityDescription]:
-    """Generate entity descriptions for a given phase"""
-    return {
-        f"Wh{index}": NumberEntityDescription(
-            key=f"Wh{index}",
-            translation_key="consumption",
-            device_class=NumberDeviceClass.ENERGY,
-            mode=NumberMode.BOX,
-            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-            native_min_value=0,
-            native_max_value=sys.maxsize,
-            entity_registry_enabled_default=False,
-        ),
-    }
-
-
-ENTITY_DESCRIPTIONS: dict[str, NumberEntityDescription] = {
-    **phase_descriptions(""),
-    **phase_descriptions("1"),
-    **phase_descriptions("2"),
-    **phase_descriptions("3"),
-}
-
-
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -59,7 +29,7 @@ async def async_setup_entry(
     async_add_entities(
         [
             SmartMaicNumber(hass, coordinator, entry, description)
-            for ent in coordinator.data
+            for ent in coordinator.data.seen_keys()
             if (description := ENTITY_DESCRIPTIONS.get(ent))
         ]
     )
@@ -74,7 +44,7 @@ class SmartMaicNumber(SmartMaicEntity, NumberEntity):
     @property
     def native_value(self) -> int | None:
         """Return the value of the entity."""
-        value = self.coordinator.data.get(self.entity_description.key)
+        value = self.coordinator.data.value(self._slot)
         return None if value is None else cast(int | None, value)
 
     async def async_set_native_value(self, value: int) -> None:
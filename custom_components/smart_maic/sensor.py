@@ -5,6 +5,7 @@ The sensor component creates multipe sensors regarding Smart MAIC status.
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import cast
 
 from homeassistant.components.sensor import (
@@ -15,9 +16,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    UnitOfTemperature,
     UnitOfElectricCurrent,
-    UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
 )
@@ -27,131 +26,13 @@ from homeassistant.helpers.typing import StateType
 
 from .const import (
     DOMAIN,
+    ENTRY_TYPE,
+    ENTRY_TYPE_SITE,
 )
 from .coordinator import SmartMaicCoordinator
-from .entity import SmartMaicEntity
-
-
-def phase_descriptions(index="") -> dict[str, SensorEntityDescription]:
-    """Generate entity descriptions for a given phase"""
-    return {
-        f"V{index}": SensorEntityDescription(
-            key=f"V{index}",
-            translation_key="voltage",
-            device_class=SensorDeviceClass.VOLTAGE,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfElectricPotential.VOLT,
-            suggested_display_precision=2,
-        ),
-        f"A{index}": SensorEntityDescription(
-            key=f"A{index}",
-            translation_key="current",
-            device_class=SensorDeviceClass.CURRENT,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
-            suggested_display_precision=2,
-        ),
-        f"W{index}": SensorEntityDescription(
-            key=f"W{index}",
-            translation_key="power",
-            device_class=SensorDeviceClass.POWER,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfPower.WATT,
-            suggested_display_precision=0,
-        ),
-        f"rW{index}": SensorEntityDescription(
-            key=f"rW{index}",
-            translation_key="return_power",
-            device_class=SensorDeviceClass.POWER,
-            state_class=SensorStateClass.MEASUREMENT,
-            native_unit_of_measurement=UnitOfPower.WATT,
-            suggested_display_precision=0,
-            entity_registry_enabled_default=False,
-        ),
-        f"Wh{index}": SensorEntityDescription(
-            key=f"Wh{index}",
-            translation_key="consumption",
-            device_class=SensorDeviceClass.ENERGY,
-            state_class=SensorStateClass.TOTAL_INCREASING,
-            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-            suggested_display_precision=0,
-        ),
-        f"rWh{index}": SensorEntityDescription(
-            key=f"rWh{index}",
-            translation_key="return",
-            device_class=SensorDeviceClass.ENERGY,
-            state_class=SensorStateClass.TOTAL,
-            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-            suggested_display_precision=0,
-            entity_registry_enabled_default=False,
-        ),
-        f"PF{index}": SensorEntityDescription(
-            key=f"PF{index}",
-            translation_key="power_factor",
-            device_class=SensorDeviceClass.POWER_FACTOR,
-            state_class=SensorStateClass.MEASUREMENT,
-            suggested_display_precision=2,
-        ),
-    }
-
-
-def point_description(index) -> dict[str, SensorEntityDescription]:
-    """Generate entity description for a point"""
-    return {
-        f"T{index}": SensorEntityDescription(
-            key=f"T{index}",
-            translation_key="point",
-            state_class=SensorStateClass.MEASUREMENT,
-        ),
-    }
-
-
-def channel_description(index) -> dict[str, SensorEntityDescription]:
-    """Generate entity description for a channel"""
-    return {
-        f"Ch{index}": SensorEntityDescription(
-            key=f"Ch{index}",
-            translation_key="channel",
-            state_class=SensorStateClass.MEASUREMENT,
-        ),
-        f"TCh{index}": SensorEntityDescription(
-            key=f"TCh{index}",
-            translation_key="total_channel",
-            state_class=SensorStateClass.MEASUREMENT,
-        ),
-    }
-
-
-ENTITY_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
-    # D101
-    **phase_descriptions(""),
-    # D103
-    **phase_descriptions("1"),
-    **phase_descriptions("2"),
-    **phase_descriptions("3"),
-    # D105
-    **point_description("1"),
-    **point_description("2"),
-    **point_description("3"),
-    **point_description("4"),
-    **point_description("5"),
-    **channel_description("1"),
-    **channel_description("2"),
-    "ADC": SensorEntityDescription(
-        key="ADC",
-        translation_key="adc",
-        state_class=SensorStateClass.MEASUREMENT,
-    ),
-    # Common
-    "Temp": SensorEntityDescription(
-        key="Temp",
-        translation_key="device_temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-}
+from .descriptions import SENSOR_DESCRIPTIONS as ENTITY_DESCRIPTIONS
+from .entity import SmartMaicEntity, SmartMaicSiteEntity
+from .site import SmartMaicSite
 
 # NOTE: dict keys here match API response
 # But we align "key" values with single phase for consistency
@@ -201,22 +82,48 @@ PHASE_TOTAL_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
 }
 
 
+SITE_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+    "W": PHASE_TOTAL_DESCRIPTIONS["W"],
+    "rW": PHASE_TOTAL_DESCRIPTIONS["rW"],
+    "A": PHASE_TOTAL_DESCRIPTIONS["A"],
+    "Wh": SensorEntityDescription(
+        key="Wh",
+        translation_key="total_consumption",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        suggested_display_precision=0,
+    ),
+    **{f"A{index}": ENTITY_DESCRIPTIONS[f"A{index}"] for index in ["1", "2", "3"]},
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Create Smart MAIC sensor entities in HASS."""
+    if entry.data.get(ENTRY_TYPE) == ENTRY_TYPE_SITE:
+        site: SmartMaicSite = hass.data[DOMAIN][entry.entry_id]
+        async_add_entities(
+            [
+                SmartMaicSiteSensor(site, entry, description)
+                for description in SITE_DESCRIPTIONS.values()
+            ]
+        )
+        return
+
     coordinator: SmartMaicCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
         [
             SmartMaicSensor(hass, coordinator, entry, description)
-            for ent in coordinator.data
+            for ent in coordinator.data.seen_keys()
             if (description := ENTITY_DESCRIPTIONS.get(ent))
         ]
     )
 
     # NOTE: check if we're dealing with 3-phase device like D103
-    if "A1" in coordinator.data:
+    if "A1" in coordinator.data.seen_keys():
         async_add_entities(
             [
                 SmartMaicPhaseTotalSensor(hass, coordinator, entry, description)
@@ -232,23 +139,64 @@ class SmartMaicSensor(SmartMaicEntity, SensorEntity):
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        value = self.coordinator.data.get(self.entity_description.key)
-        return None if value is None else cast(StateType, value)
+        value = self.coordinator.data.value(self._slot)
+        if value is None:
+            return None
+        if self.entity_description.state_class == SensorStateClass.TOTAL_INCREASING:
+            value = self.coordinator.counter_value(self.entity_description.key, value)
+        return cast(StateType, value)
 
 
 class SmartMaicPhaseTotalSensor(SmartMaicEntity, SensorEntity):
     """Representation of the Smart MAIC total sensor."""
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SmartMaicCoordinator,
+        entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize a Smart MAIC total sensor."""
+        super().__init__(hass, coordinator, entry, description)
+
+        self._phase_keys = [f"{description.key}{index}" for index in ["1", "2", "3"]]
+        self._phase_slots = [coordinator.data.slot(key) for key in self._phase_keys]
+
+    @property
+    def metric_keys(self) -> Iterable[str]:
+        """Return keys of the metrics consumed by the entity."""
+        return self._phase_keys
+
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        base_key = self.entity_description.key
         data = self.coordinator.data
+        values = [data.value(slot) for slot in self._phase_slots]
 
-        if data:
-            return cast(
-                StateType,
-                data[f"{base_key}1"] + data[f"{base_key}2"] + data[f"{base_key}3"],
-            )
+        if None in values:
+            return None
+
+        if self.entity_description.state_class == SensorStateClass.TOTAL_INCREASING:
+            values = [
+                self.coordinator.counter_value(key, value)
+                for key, value in zip(self._phase_keys, values)
+            ]
+            if None in values:
+                return None
 
-        return None
+        return cast(StateType, sum(values))
+
+
+class SmartMaicSiteSensor(SmartMaicSiteEntity, SensorEntity):
+    """Representation of the Smart MAIC site total sensor."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return cast(StateType, self._site.value(self.entity_description.key))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the number of devices summed up."""
+        return {"device_count": self._site.device_count}
@@ -0,0 +1,149 @@
+"""Services for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+
+from .capture import DEFAULT_MAX_SIZE, capture_path, read_capture
+from .const import (
+    DEVICE_ID,
+    DOMAIN,
+    SERVICE_GET_CONFIG,
+    SERVICE_GET_WDATA,
+    SERVICE_START_CAPTURE,
+    SERVICE_START_REPLAY,
+    SERVICE_STOP_CAPTURE,
+    SERVICE_STOP_REPLAY,
+)
+from .coordinator import SmartMaicCoordinator
+
+ATTR_FILENAME = "filename"
+ATTR_MAX_SIZE = "max_size"
+ATTR_SPEED = "speed"
+
+SERVICE_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+CAPTURE_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_MAX_SIZE, default=DEFAULT_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1024)
+        ),
+    }
+)
+
+REPLAY_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_SPEED, default=1): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, device_id: str) -> SmartMaicCoordinator:
+    """Get coordinator of a Smart MAIC device."""
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry_id in device.config_entries:
+            coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+            if isinstance(coordinator, SmartMaicCoordinator):
+                return coordinator
+
+    raise ServiceValidationError(f"Smart MAIC device {device_id} is not loaded")
+
+
+def _get_capture_path(
+    hass: HomeAssistant, coordinator: SmartMaicCoordinator, call: ServiceCall
+) -> str:
+    """Get capture file path from the call or the default one of the device."""
+    filename = call.data.get(ATTR_FILENAME)
+    if not filename:
+        filename = f"{coordinator.config_entry.data[DEVICE_ID]}.capture"
+    return capture_path(hass, filename)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up Smart MAIC services."""
+
+    async def get_config(call: ServiceCall) -> ServiceResponse:
+        """Get device config."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        try:
+            return await coordinator.async_get_cached_config()
+        except ConnectionError as ex:
+            raise HomeAssistantError("Failed to connect to Smart MAIC") from ex
+
+    async def get_wdata(call: ServiceCall) -> ServiceResponse:
+        """Get device instantaneous values."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        try:
+            return await coordinator.async_get_cached_wdata()
+        except ConnectionError as ex:
+            raise HomeAssistantError("Failed to connect to Smart MAIC") from ex
+
+    async def start_capture(call: ServiceCall) -> None:
+        """Start capturing device MQTT payloads."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        await coordinator.async_start_capture(
+            _get_capture_path(hass, coordinator, call), call.data[ATTR_MAX_SIZE]
+        )
+
+    async def stop_capture(call: ServiceCall) -> None:
+        """Stop capturing device MQTT payloads."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        await coordinator.async_stop_capture()
+
+    async def start_replay(call: ServiceCall) -> None:
+        """Start replaying captured payloads to the device."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        path = _get_capture_path(hass, coordinator, call)
+        records = await hass.async_add_executor_job(read_capture, path)
+        if records is None:
+            raise ServiceValidationError(f"Capture {path} does not exist")
+        await coordinator.async_start_replay(records, call.data[ATTR_SPEED])
+
+    async def stop_replay(call: ServiceCall) -> None:
+        """Stop replaying captured payloads."""
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        await coordinator.async_stop_replay()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_CAPTURE, start_capture, schema=CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, stop_capture, schema=SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_REPLAY, start_replay, schema=REPLAY_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_REPLAY, stop_replay, schema=SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONFIG,
+        get_config,
+        schema=SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_WDATA,
+        get_wdata,
+        schema=SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,291 @@
+"""Site-wide aggregation for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, TAG, TAGS
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.site"
+# NOTE: membership changes are saved soon, energy periodically,
+# a delayed save rescheduled on every message would never happen
+SAVE_DELAY = 1
+SAVE_INTERVAL = 60
+
+SITE_KEYS = ["W", "rW", "Wh", "A", "A1", "A2", "A3"]
+# NOTE: device metrics summed up by sites besides energy counters
+CONTRIBUTION_KEYS = [
+    f"{key}{index}" for key in ["W", "rW", "A"] for index in ["", "1", "2", "3"]
+]
+# NOTE: kept for unloaded devices so the site energy total does not drop
+KEPT_KEYS = ["Wh"]
+# NOTE: totals growing by consumption of member devices only
+ENERGY_KEYS = ["Wh"]
+NOTIFY_DELAY = 1
+
+
+def entry_tags(entry: ConfigEntry) -> set[str]:
+    """Return tags set in options of a device config entry."""
+    tags = entry.options.get(TAGS) or ""
+    return {tag.strip() for tag in tags.split(",") if tag.strip()}
+
+
+class SmartMaicSite:
+    """Running totals of Smart MAIC devices, optionally filtered by a tag.
+
+    Energy totals only grow by what member devices consumed since they
+    joined the site, so devices joining or leaving do not count as
+    consumption.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        energy: dict[str, float] | None = None,
+    ) -> None:
+        """Init Smart MAIC site."""
+        self.hass = hass
+        self.tag: str | None = entry.data.get(TAG) or None
+        self.totals: dict[str, float] = dict.fromkeys(SITE_KEYS, 0.0) | (energy or {})
+        self._counts: dict[str, int] = dict.fromkeys(SITE_KEYS, 0)
+        self._contributions: dict[str, dict[str, float]] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self._notify_unsub: Callable[[], None] | None = None
+
+    @property
+    def device_count(self) -> int:
+        """Return the number of devices contributing to the totals."""
+        return len(self._contributions)
+
+    def value(self, key: str) -> float | None:
+        """Return total of a key or None if no device contributes to it."""
+        if not self._counts[key]:
+            return None
+        return self.totals[key]
+
+    def matches(self, tags: set[str]) -> bool:
+        """Check if a device with given tags belongs to the site."""
+        return self.tag is None or self.tag in tags
+
+    @callback
+    def async_update(
+        self, entry_id: str, contribution: dict[str, float] | None
+    ) -> None:
+        """Replace contribution of a device applying only the delta."""
+        old = self._contributions.pop(entry_id, None)
+        if contribution is not None:
+            self._contributions[entry_id] = contribution
+        elif old is None:
+            return
+
+        old = old or {}
+        new = contribution or {}
+        totals = self.totals
+        counts = self._counts
+        for key in SITE_KEYS:
+            if count := (key in new) - (key in old):
+                counts[key] += count
+            if key in ENERGY_KEYS:
+                if key in old and key in new and (delta := new[key] - old[key]) > 0:
+                    totals[key] += delta
+            elif not counts[key]:
+                # NOTE: drop accumulated rounding errors
+                totals[key] = 0.0
+            elif delta := new.get(key, 0.0) - old.get(key, 0.0):
+                totals[key] += delta
+
+        if self._notify_unsub is None:
+            self._notify_unsub = async_call_later(
+                self.hass, NOTIFY_DELAY, self._async_notify
+            )
+
+    @callback
+    def _async_notify(self, _now: datetime) -> None:
+        """Notify listeners at most once per delay."""
+        self._notify_unsub = None
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for updates of the totals."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def energy(self) -> dict[str, float]:
+        """Return energy totals to keep."""
+        return {key: self.totals[key] for key in ENERGY_KEYS}
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel pending notification."""
+        if self._notify_unsub is not None:
+            self._notify_unsub()
+            self._notify_unsub = None
+        self._listeners.clear()
+
+
+class SmartMaicAggregator:
+    """Domain-level aggregator feeding device contributions to sites.
+
+    Energy contributions of unloaded devices and energy totals of sites are
+    kept and stored, so site energy totals do not drop while a device or a
+    site is reloaded or not yet set up after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init Smart MAIC aggregator."""
+        self._sites: dict[str, SmartMaicSite] = {}
+        self._devices: dict[str, tuple[set[str], dict[str, float]]] = {}
+        self._energy: dict[str, dict[str, float]] = {}
+        self._save_delay: float | None = None
+        self._device_listeners: dict[
+            str, tuple[Callable[[], set[str]], Callable[[bool], None]]
+        ] = {}
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    async def async_load(self, entry_ids: Iterable[str]) -> None:
+        """Load kept contributions and site energy of existing config entries."""
+        entry_ids = set(entry_ids)
+        data = await self._store.async_load() or {}
+        self._devices = {
+            entry_id: (
+                set(device["tags"]),
+                {key: float(device[key]) for key in KEPT_KEYS if key in device},
+            )
+            for entry_id, device in data.get("devices", {}).items()
+            if entry_id in entry_ids
+        }
+        self._energy = {
+            entry_id: {key: float(site[key]) for key in ENERGY_KEYS if key in site}
+            for entry_id, site in data.get("sites", {}).items()
+            if entry_id in entry_ids
+        }
+
+    @callback
+    def async_add_site(self, entry_id: str, site: SmartMaicSite) -> Callable[[], None]:
+        """Add a site and seed it with contributions of known devices."""
+        self._sites[entry_id] = site
+        for device_entry_id, (tags, contribution) in self._devices.items():
+            if site.matches(tags):
+                site.async_update(device_entry_id, contribution)
+        self.async_notify_devices()
+
+        @callback
+        def remove_site() -> None:
+            self._sites.pop(entry_id, None)
+            self._energy[entry_id] = site.energy()
+            site.async_shutdown()
+            self.async_notify_devices()
+            self._async_schedule_save(SAVE_DELAY)
+
+        return remove_site
+
+    def site_energy(self, entry_id: str) -> dict[str, float]:
+        """Return kept energy totals of a site."""
+        return self._energy.get(entry_id, {})
+
+    @callback
+    def async_add_device_listener(
+        self,
+        entry_id: str,
+        get_tags: Callable[[], set[str]],
+        site_callback: Callable[[bool], None],
+    ) -> Callable[[], None]:
+        """Listen whether a loaded site includes a device."""
+        self._device_listeners[entry_id] = (get_tags, site_callback)
+        site_callback(self._has_site(get_tags()))
+
+        @callback
+        def remove_device_listener() -> None:
+            self._device_listeners.pop(entry_id, None)
+
+        return remove_device_listener
+
+    @callback
+    def async_notify_devices(self) -> None:
+        """Tell every device whether a loaded site includes it."""
+        for get_tags, site_callback in list(self._device_listeners.values()):
+            site_callback(self._has_site(get_tags()))
+
+    def _has_site(self, tags: set[str]) -> bool:
+        """Check if a loaded site includes a device with given tags."""
+        return any(site.matches(tags) for site in self._sites.values())
+
+    @callback
+    def async_update_device(
+        self, entry_id: str, tags: set[str], contribution: dict[str, float]
+    ) -> None:
+        """Update contribution of a device to all sites."""
+        old = self._devices.get(entry_id)
+        self._devices[entry_id] = (tags, contribution)
+        for site in self._sites.values():
+            site.async_update(entry_id, contribution if site.matches(tags) else None)
+        self._async_schedule_save(
+            SAVE_DELAY if old is None or old[0] != tags else SAVE_INTERVAL
+        )
+
+    @callback
+    def async_unload_device(self, entry_id: str) -> None:
+        """Keep only energy contribution of an unloaded device."""
+        if (device := self._devices.get(entry_id)) is None:
+            return
+        tags, contribution = device
+        self.async_update_device(
+            entry_id,
+            tags,
+            {key: contribution[key] for key in KEPT_KEYS if key in contribution},
+        )
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Remove contribution of a device or kept energy of a site."""
+        if self._energy.pop(entry_id, None) is not None:
+            self._async_schedule_save(SAVE_DELAY)
+        if self._devices.pop(entry_id, None) is None:
+            return
+        for site in self._sites.values():
+            site.async_update(entry_id, None)
+        self._async_schedule_save(SAVE_DELAY)
+
+    @callback
+    def _async_schedule_save(self, delay: float) -> None:
+        """Schedule a save unless an earlier one is pending."""
+        if self._save_delay is None or delay < self._save_delay:
+            self._save_delay = delay
+            self._store.async_delay_save(self._data_to_save, delay)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return kept contributions and site energy to store."""
+        self._save_delay = None
+        return {
+            "devices": {
+                entry_id: {
+                    "tags": sorted(tags),
+                    **{
+                        key: contribution[key]
+                        for key in KEPT_KEYS
+                        if key in contribution
+                    },
+                }
+                for entry_id, (tags, contribution) in self._devices.items()
+            },
+            "sites": self._energy
+            | {entry_id: site.energy() for entry_id, site in self._sites.items()},
+        }
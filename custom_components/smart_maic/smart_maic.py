@@ -3,10 +3,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from urllib.parse import urlparse, urlencode
-import requests
 
 from .const import (
     DEVICE_ID,
@@ -16,6 +15,9 @@ from .const import (
     PREFIX,
 )
 
+if TYPE_CHECKING:
+    import requests
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -71,6 +73,9 @@ class SmartMaic:
 
     def _get_request(self, **kwargs) -> requests.Response:
         """Make GET request to the Smart MAIC API."""
+        # NOTE: imported on first request, HTTP is only needed for commands
+        import requests  # pylint: disable=import-outside-toplevel
+
         url = urlparse(f"http://{self._ip_address}/")
         url = url._replace(query=urlencode(kwargs))
 
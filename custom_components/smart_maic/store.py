@@ -0,0 +1,131 @@
+"""Compact state store for the Smart MAIC integration."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+import math
+from typing import Any
+
+from .descriptions import STATE_KEYS
+
+NAN = math.nan
+
+
+class SmartMaicLayout:
+    """Fixed slot layout shared by all devices."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Init Smart MAIC layout."""
+        self.keys: tuple[str, ...] = tuple(keys)
+        self.slots: dict[str, int] = {key: slot for slot, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return len(self.keys)
+
+
+LAYOUT = SmartMaicLayout(STATE_KEYS)
+
+
+class SmartMaicStore:
+    """Per-device values kept in a typed array indexed by layout slots."""
+
+    def __init__(self, layout: SmartMaicLayout = LAYOUT) -> None:
+        """Init Smart MAIC store."""
+        self.layout = layout
+        self._values = array("d", [NAN]) * len(layout)
+        self._seen = bytearray(len(layout))
+        self._has_data = False
+
+    def slot(self, key: str) -> int | None:
+        """Return slot index for a key."""
+        return self.layout.slots.get(key)
+
+    def value(self, slot: int | None) -> float | int | None:
+        """Return value stored in a slot."""
+        if slot is None or not self._has_data:
+            return None
+        value = self._values[slot]
+        if math.isnan(value):
+            return None
+        return to_number(value)
+
+    def update(self, data: Mapping[str, Any]) -> None:
+        """Replace all values with the ones from a device payload."""
+        values = self._values
+        seen = self._seen
+        for slot, key in enumerate(self.layout.keys):
+            if key in data:
+                values[slot] = to_float(data[key])
+                seen[slot] = 1
+            else:
+                values[slot] = NAN
+        self._has_data = True
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a single value."""
+        if (slot := self.slot(key)) is not None:
+            self._values[slot] = to_float(value)
+            self._seen[slot] = 1
+            self._has_data = True
+
+    def clear(self) -> None:
+        """Reset all values."""
+        self._values[:] = array("d", [NAN]) * len(self.layout)
+        self._has_data = False
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Reset values of all keys except given ones."""
+        keep = {self.slot(key) for key in keys}
+        for slot in range(len(self.layout)):
+            if slot not in keep:
+                self._values[slot] = NAN
+
+    def seen_keys(self) -> list[str]:
+        """Return keys the device has published, even if without a value."""
+        return [key for key, seen in zip(self.layout.keys, self._seen) if seen]
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return present values as a dict."""
+        return {key: self[key] for key in self}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return value for a key or default."""
+        value = self.value(self.slot(key))
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> float | int:
+        """Return value for a key."""
+        if (value := self.get(key)) is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        """Check if a key has a value."""
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over keys having a value."""
+        if not self._has_data:
+            return
+        for key, value in zip(self.layout.keys, self._values):
+            if not math.isnan(value):
+                yield key
+
+    def __bool__(self) -> bool:
+        """Return whether the store holds data."""
+        return self._has_data
+
+
+def to_number(value: float) -> float | int:
+    """Return int for whole values to keep states as published by the device."""
+    return int(value) if value.is_integer() else value
+
+
+def to_float(value: Any) -> float:
+    """Convert a payload value to float, NaN if missing or not numeric."""
+    try:
+        return NAN if value is None else float(value)
+    except (TypeError, ValueError):
+        return NAN
@@ -14,14 +14,9 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import SmartMaicCoordinator
+from .descriptions import SWITCH_DESCRIPTIONS as ENTITY_DESCRIPTIONS
 from .entity import SmartMaicEntity
 
-ENTITY_DESCRIPTIONS: dict[str, SwitchEntityDescription] = {
-    "OUT": SwitchEntityDescription(
-        key="OUT", translation_key="dry_switch", icon="mdi:home-switch"
-    ),
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -32,7 +27,7 @@ async def async_setup_entry(
     async_add_entities(
         [
             SmartMaicSwitch(hass, coordinator, entry, description)
-            for ent in coordinator.data
+            for ent in coordinator.data.seen_keys()
             if (description := ENTITY_DESCRIPTIONS.get(ent))
         ]
     )
@@ -46,7 +41,7 @@ class SmartMaicSwitch(SmartMaicEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return the status of the switch."""
-        value = self.coordinator.data.get(self.entity_description.key)
+        value = self.coordinator.data.value(self._slot)
         return None if value is None else value == 1
 
     async def async_turn_on(self) -> None:
@@ -59,6 +54,4 @@ class SmartMaicSwitch(SmartMaicEntity, SwitchEntity):
 
     async def _set_dry_swtich(self, value):
         await self.coordinator.async_set_dry_switch(value)
-        data = {} | self.coordinator.data
-        data[self.entity_description.key] = value
-        self.coordinator.async_set_updated_data(data)
+        self.coordinator.async_set_value(self.entity_description.key, value)
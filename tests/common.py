@@ -0,0 +1,132 @@
+"""Common helpers for Smart MAIC tests."""
+
+import asyncio
+from datetime import timedelta
+import json
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.smart_maic.const import (
+    DEVICE_ID,
+    DEVICE_NAME,
+    DEVICE_TYPE,
+    DOMAIN,
+    ENTRY_TYPE,
+    ENTRY_TYPE_SITE,
+    IP_ADDRESS,
+    PIN,
+    PREFIX,
+    TAG,
+)
+from custom_components.smart_maic.coordinator import SmartMaicCoordinator
+
+D101_PAYLOAD = {
+    "V": 230.1,
+    "A": 1.5,
+    "W": 345,
+    "rW": 0,
+    "Wh": 1000,
+    "rWh": 0,
+    "PF": 0.95,
+    "Temp": 35,
+}
+
+
+def device_entry(devid: str, devtype: str = "D101", **options: Any) -> MockConfigEntry:
+    """Return config entry of a device."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=devid,
+        title=devid,
+        data={
+            IP_ADDRESS: "192.0.2.1",
+            PIN: "0000",
+            DEVICE_NAME: devid,
+            DEVICE_ID: devid,
+            DEVICE_TYPE: devtype,
+        },
+        options=options,
+    )
+
+
+def site_entry(tag: str = "") -> MockConfigEntry:
+    """Return config entry of a site of all devices or of tagged ones."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=f"site-{tag}",
+        title="Site",
+        data={DEVICE_NAME: "Site", ENTRY_TYPE: ENTRY_TYPE_SITE, TAG: tag},
+    )
+
+
+def fire_json(hass: HomeAssistant, devid: str, data: dict[str, Any]) -> None:
+    """Fire a JSON payload of a device."""
+    async_fire_mqtt_message(hass, f"{PREFIX}/{devid}/JSON", json.dumps(data))
+
+
+def tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float) -> None:
+    """Move frozen time forward and fire time changed."""
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+
+
+async def async_setup_integration(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """Set up entries not loaded yet, feeding first payloads of devices by devid."""
+    pending = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.NOT_LOADED
+    ]
+    entries = [entry for entry in pending if entry.data.get(DEVICE_ID) in payloads]
+
+    async def async_setup() -> bool:
+        if DOMAIN not in hass.config.components:
+            return await async_setup_component(hass, DOMAIN, {})
+        results = await asyncio.gather(
+            *(hass.config_entries.async_setup(entry.entry_id) for entry in pending)
+        )
+        return all(results)
+
+    setup = hass.async_create_task(async_setup())
+    while not all(
+        isinstance(hass.data.get(DOMAIN, {}).get(entry.entry_id), SmartMaicCoordinator)
+        and hass.data[DOMAIN][entry.entry_id]._subscriptions
+        for entry in entries
+    ):
+        await asyncio.sleep(0)
+    for devid, data in payloads.items():
+        fire_json(hass, devid, data)
+    # NOTE: wake up setups polling for the first payload
+    while not setup.done():
+        tick(hass, freezer, 1)
+        await asyncio.sleep(0)
+    assert setup.result()
+    await hass.async_block_till_done()
+    assert all(
+        entry.state is ConfigEntryState.LOADED
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+
+
+def subscribed_topics(hass: HomeAssistant, devid: str) -> set[str]:
+    """Return MQTT topics subscribed for a device."""
+    client = hass.data["mqtt"].client
+    return {
+        topic
+        for topic, subscriptions in client._simple_subscriptions.items()
+        if subscriptions and topic.split("/")[-2] == devid
+    }
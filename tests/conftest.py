@@ -0,0 +1,9 @@
+"""Fixtures for Smart MAIC tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable loading of custom integrations in all tests."""
+    yield
@@ -0,0 +1,81 @@
+"""Tests of publish cadence estimation."""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.smart_maic.cadence import (
+    MIN_SAMPLES,
+    SAFETY_FACTOR,
+    P2Quantile,
+    SmartMaicCadence,
+)
+
+
+@pytest.mark.parametrize("p", [0.5, 0.95])
+@pytest.mark.parametrize(
+    "sample",
+    [
+        lambda: random.uniform(0, 100),
+        lambda: random.expovariate(0.1),
+        lambda: random.gauss(60, 5),
+    ],
+)
+def test_p2_quantile_accuracy(p: float, sample) -> None:
+    """Estimate quantiles close to exact ones."""
+    random.seed(0)
+    values = [sample() for _ in range(10000)]
+    quantile = P2Quantile(p)
+    for value in values:
+        quantile.add(value)
+
+    exact = sorted(values)[int(p * len(values))]
+    spread = sorted(values)[int(0.99 * len(values))] - sorted(values)[0]
+    assert quantile.count == len(values)
+    assert abs(quantile.value - exact) < 0.02 * spread
+
+
+def test_p2_quantile_few_samples() -> None:
+    """Return an observed value before five samples are known."""
+    quantile = P2Quantile(0.95)
+    assert quantile.value is None
+    for value in [3.0, 1.0, 2.0]:
+        quantile.add(value)
+    assert quantile.value == 3.0
+
+
+def feed(cadence: SmartMaicCadence, intervals: list[float]) -> None:
+    """Feed arrivals separated by intervals, starting with one arrival."""
+    now = 1000.0
+    with patch("custom_components.smart_maic.cadence.monotonic") as monotonic:
+        for interval in [0.0, *intervals]:
+            now += interval
+            monotonic.return_value = now
+            cadence.add_arrival()
+
+
+@pytest.mark.parametrize("learned", [MIN_SAMPLES, 2 * MIN_SAMPLES])
+def test_outage_is_not_a_sample(learned: int) -> None:
+    """Keep the learned expiration after the gap of an outage."""
+    cadence = SmartMaicCadence()
+    feed(cadence, [5.0] * learned + [3600.0] + [5.0] * 3 + [3600.0])
+    assert cadence.expiration == 5.0 * SAFETY_FACTOR
+
+
+def test_cadence_change() -> None:
+    """Learn the new interval once it is sustained."""
+    cadence = SmartMaicCadence()
+    feed(cadence, [5.0] * 20 + [60.0] * (MIN_SAMPLES - 1))
+    assert cadence.expiration == 5.0 * SAFETY_FACTOR
+
+    cadence = SmartMaicCadence()
+    feed(cadence, [5.0] * 20 + [60.0] * MIN_SAMPLES)
+    assert cadence.expiration == 60.0 * SAFETY_FACTOR
+
+
+def test_not_learned_yet() -> None:
+    """Return no expiration before enough samples."""
+    cadence = SmartMaicCadence()
+    feed(cadence, [5.0] * (MIN_SAMPLES - 1))
+    assert cadence.expiration is None
@@ -0,0 +1,124 @@
+"""Tests of coalescing bursts of MQTT messages."""
+
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smart_maic.const import DOMAIN, PER_METRIC_TOPICS, PREFIX
+from custom_components.smart_maic.coordinator import SmartMaicCoordinator
+
+from .common import (
+    D101_PAYLOAD,
+    async_setup_integration,
+    device_entry,
+    fire_json,
+    tick,
+)
+
+
+async def async_setup_meter(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, **options: Any
+) -> SmartMaicCoordinator:
+    """Set up a D101 meter and wait for the coalescing window to close."""
+    entry = device_entry("meter", **options)
+    entry.add_to_hass(hass)
+    await async_setup_integration(hass, freezer, {"meter": D101_PAYLOAD})
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+def count_updates(coordinator: SmartMaicCoordinator) -> list[None]:
+    """Return a list growing on every coordinator update."""
+    updates: list[None] = []
+    coordinator.async_add_listener(lambda: updates.append(None))
+    return updates
+
+
+def power(hass: HomeAssistant) -> str:
+    """Return state of the power sensor."""
+    return hass.states.get("sensor.meter_power").state
+
+
+async def test_leading_edge_and_latest_snapshot(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Apply the first message at once and the latest one when the window closes."""
+    coordinator = await async_setup_meter(hass, freezer)
+    updates = count_updates(coordinator)
+
+    fire_json(hass, "meter", D101_PAYLOAD | {"W": 100})
+    await hass.async_block_till_done()
+    assert power(hass) == "100"
+    assert len(updates) == 1
+
+    fire_json(hass, "meter", D101_PAYLOAD | {"W": 200})
+    fire_json(hass, "meter", D101_PAYLOAD | {"W": 300})
+    await hass.async_block_till_done()
+    assert power(hass) == "100"
+    assert len(updates) == 1
+
+    tick(hass, freezer, 1)
+    await hass.async_block_till_done()
+    assert power(hass) == "300"
+    assert len(updates) == 2
+
+    # NOTE: nothing pending, so the window closes without an update
+    tick(hass, freezer, 1)
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+
+
+async def test_metrics_merge_with_snapshot(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Merge metric values newer than a snapshot and drop older ones."""
+    coordinator = await async_setup_meter(hass, freezer, **{PER_METRIC_TOPICS: True})
+    assert coordinator.data["V"] == 230.1
+
+    async_fire_mqtt_message(hass, f"{PREFIX}/meter/W", "400")
+    await hass.async_block_till_done()
+    assert coordinator.data["W"] == 400
+
+    async_fire_mqtt_message(hass, f"{PREFIX}/meter/V", "231")
+    coordinator.async_json_payload_received('{"V": 232, "W": 500, "Temp": 36}')
+    async_fire_mqtt_message(hass, f"{PREFIX}/meter/W", "600")
+    await hass.async_block_till_done()
+    assert coordinator.data["W"] == 400
+
+    tick(hass, freezer, 1)
+    await hass.async_block_till_done()
+    assert coordinator.data["V"] == 232
+    assert coordinator.data["W"] == 600
+    assert coordinator.data["Temp"] == 36
+    assert "PF" not in coordinator.data
+
+
+async def test_sample_listeners_see_every_message(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Feed sample listeners with every message, including coalesced ones."""
+    coordinator = await async_setup_meter(hass, freezer)
+    samples: list[dict[str, Any]] = []
+    remove = coordinator.async_add_sample_listener(samples.append)
+
+    for energy in [1001, 1002, 1003]:
+        fire_json(hass, "meter", D101_PAYLOAD | {"Wh": energy})
+    await hass.async_block_till_done()
+
+    assert [sample["Wh"] for sample in samples] == [1001, 1002, 1003]
+
+    remove()
+    fire_json(hass, "meter", D101_PAYLOAD)
+    await hass.async_block_till_done()
+    assert len(samples) == 3
@@ -0,0 +1,92 @@
+"""Tests of energy counter integrity."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smart_maic.counters import (
+    SAVE_INTERVAL,
+    SmartMaicCounters,
+    storage_key,
+)
+
+from .common import tick
+
+
+@pytest.fixture
+async def counters(hass: HomeAssistant) -> AsyncGenerator[SmartMaicCounters]:
+    """Return counters saved at the end like on shutdown."""
+    counters = SmartMaicCounters(hass, "entry")
+    yield counters
+    await counters.async_save()
+
+
+def feed(counters: SmartMaicCounters, *values: float) -> list[float | int]:
+    """Feed raw values and return corrected ones."""
+    corrected = []
+    for value in values:
+        counters.async_update({"Wh": value})
+        corrected.append(counters.corrected("Wh", value))
+    return corrected
+
+
+async def test_spurious_drop(counters: SmartMaicCounters) -> None:
+    """Ignore a single sample below the last value."""
+    assert feed(counters, 100, 110, 5, 120) == [100, 110, 110, 120]
+    assert counters.total("Wh") == 120
+
+
+async def test_reset(counters: SmartMaicCounters) -> None:
+    """Continue from the last value once a drop is confirmed."""
+    assert feed(counters, 100, 110, 5, 6, 10) == [100, 110, 110, 111, 115]
+    assert counters.total("Wh") == 115
+
+
+async def test_reset_landing_lower(counters: SmartMaicCounters) -> None:
+    """Never decrease when the sample confirming a reset is lower."""
+    corrected = feed(counters, 100, 110, 50, 5, 8)
+    assert corrected == [100, 110, 110, 110, 113]
+    assert corrected == sorted(corrected)
+
+
+async def test_save_and_load(
+    hass: HomeAssistant, hass_storage: dict[str, Any], counters: SmartMaicCounters
+) -> None:
+    """Restore offsets and last values saved on shutdown."""
+    feed(counters, 100, 110, 5, 6)
+    await counters.async_save()
+
+    restored = SmartMaicCounters(hass, "entry")
+    await restored.async_load()
+    assert restored.total("Wh") == 111
+    assert restored.corrected("Wh", 7) == 112
+
+
+async def test_save_while_publishing(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    counters: SmartMaicCounters,
+) -> None:
+    """Save new offsets soon and last values periodically despite samples."""
+    key = storage_key("entry")
+    feed(counters, 100)
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["Wh"] == {"last": 100, "offset": 0.0}
+
+    for value in range(101, 101 + SAVE_INTERVAL // 5 + 1):
+        feed(counters, value)
+        tick(hass, freezer, 5)
+        await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["Wh"]["last"] > 100
+
+    feed(counters, 5, 6)
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["Wh"]["last"] == 6
+    assert hass_storage[key]["data"]["Wh"]["offset"] > 0
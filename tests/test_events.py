@@ -0,0 +1,59 @@
+"""Tests of data events."""
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_capture_events
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smart_maic.const import EVENT_DATA, FIRE_EVENTS
+
+from .common import async_setup_integration, device_entry, fire_json, tick
+
+D103_PAYLOAD = {
+    "V1": 230.5,
+    "V2": 231,
+    "V3": 229.5,
+    "A1": 1.25,
+    "A2": 2,
+    "A3": 0.5,
+    "W1": 100,
+    "W2": 200,
+    "W3": 300,
+    "Wh1": 1000,
+    "Wh2": 2000,
+    "Wh3": 3000,
+    "Temp": 40,
+    "Uptime": "1d 02:03",
+}
+
+
+async def test_event_has_full_payload(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Fire the payload as published with derived phase totals."""
+    entry = device_entry("meter", "D103", **{FIRE_EVENTS: True})
+    entry.add_to_hass(hass)
+    await async_setup_integration(hass, freezer, {"meter": D103_PAYLOAD})
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_DATA)
+    fire_json(hass, "meter", D103_PAYLOAD)
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["devid"] == "meter"
+    assert events[0].data["devtype"] == "D103"
+    assert events[0].data["data"] == D103_PAYLOAD
+    assert type(events[0].data["data"]["W1"]) is int
+    assert events[0].data["derived"] == {"A": 3.75, "W": 600, "Wh": 6000}
+
+    # NOTE: data expires after the default expiration of 90 seconds
+    tick(hass, freezer, 120)
+    await hass.async_block_till_done()
+
+    assert events[-1].data["data"] == {}
+    assert events[-1].data["derived"] == {}
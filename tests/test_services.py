@@ -0,0 +1,55 @@
+"""Tests of Smart MAIC services."""
+
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.redact import REDACTED
+
+from custom_components.smart_maic.const import DOMAIN, SERVICE_GET_CONFIG
+
+from .common import D101_PAYLOAD, async_setup_integration, device_entry
+
+CONFIG = {
+    "serv": "192.0.2.10",
+    "port": 1883,
+    "uname": "user",
+    "pass": "secret",
+    "wifi": [{"ssid": "home", "wpass": "secret"}],
+    "about": {"devid": {"value": "meter"}},
+}
+
+
+async def test_get_config_redacts_credentials(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Return and cache device config without credentials."""
+    device_entry("meter").add_to_hass(hass)
+    await async_setup_integration(hass, freezer, {"meter": D101_PAYLOAD})
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "meter")})
+
+    with patch(
+        "custom_components.smart_maic.smart_maic.SmartMaic.get_config",
+        return_value=CONFIG,
+    ) as get_config:
+        for _ in range(2):
+            response = await hass.services.async_call(
+                DOMAIN,
+                SERVICE_GET_CONFIG,
+                {"device_id": device.id},
+                blocking=True,
+                return_response=True,
+            )
+            assert response == CONFIG | {
+                "uname": REDACTED,
+                "pass": REDACTED,
+                "wifi": [{"ssid": "home", "wpass": REDACTED}],
+            }
+
+    assert get_config.call_count == 1
+    assert CONFIG["pass"] == "secret"
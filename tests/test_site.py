@@ -0,0 +1,110 @@
+"""Tests of site totals."""
+
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smart_maic.const import TAGS
+from custom_components.smart_maic.site import SAVE_INTERVAL, STORAGE_KEY
+
+from .common import (
+    D101_PAYLOAD,
+    async_setup_integration,
+    device_entry,
+    fire_json,
+    site_entry,
+    tick,
+)
+
+ENERGY = "sensor.site_total_consumption"
+
+
+def energy(hass: HomeAssistant) -> float:
+    """Return the site energy total."""
+    return float(hass.states.get(ENERGY).state)
+
+
+async def publish(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, devid: str, wh: float
+) -> None:
+    """Publish a payload of a device with given energy and let sites update."""
+    fire_json(hass, devid, D101_PAYLOAD | {"Wh": wh})
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+
+
+async def test_membership_changes(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Count only energy consumed by devices while they belong to the site."""
+    device_entry("home", **{TAGS: "home"}).add_to_hass(hass)
+    other = device_entry("other")
+    other.add_to_hass(hass)
+    site = site_entry("home")
+    site.add_to_hass(hass)
+    await async_setup_integration(
+        hass, freezer, {"home": D101_PAYLOAD, "other": D101_PAYLOAD | {"Wh": 5000}}
+    )
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+    assert energy(hass) == 0
+
+    await publish(hass, freezer, "home", 1100)
+    assert energy(hass) == 100
+
+    # NOTE: joining the site does not add the lifetime counter of the device
+    hass.config_entries.async_update_entry(other, options={TAGS: "home"})
+    await hass.async_block_till_done()
+    await publish(hass, freezer, "other", 5000)
+    assert energy(hass) == 100
+
+    await publish(hass, freezer, "other", 5050)
+    assert energy(hass) == 150
+
+    # NOTE: leaving or being removed is not negative consumption
+    hass.config_entries.async_update_entry(other, options={TAGS: ""})
+    await hass.async_block_till_done()
+    await publish(hass, freezer, "other", 5100)
+    assert energy(hass) == 150
+
+    await publish(hass, freezer, "home", 1120)
+    assert await hass.config_entries.async_remove(other.entry_id)
+    await hass.async_block_till_done()
+    assert energy(hass) == 170
+
+    # NOTE: the total survives a reload of the site
+    assert await hass.config_entries.async_reload(site.entry_id)
+    await hass.async_block_till_done()
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+    assert energy(hass) == 170
+
+    await publish(hass, freezer, "home", 1130)
+    assert energy(hass) == 180
+
+
+async def test_save_while_publishing(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Save site energy although devices publish more often than the delay."""
+    device_entry("meter").add_to_hass(hass)
+    site = site_entry()
+    site.add_to_hass(hass)
+    await async_setup_integration(hass, freezer, {"meter": D101_PAYLOAD})
+
+    for index in range(1, 2 * SAVE_INTERVAL // 10):
+        await publish(hass, freezer, "meter", 1000 + index)
+        tick(hass, freezer, 8)
+        await hass.async_block_till_done()
+
+    data = hass_storage[STORAGE_KEY]["data"]
+    assert data["sites"][site.entry_id]["Wh"] > 0
+    assert data["devices"]
@@ -0,0 +1,207 @@
+"""Soak test of many Smart MAIC devices over a simulated hour."""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_mqtt_message
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import storage
+
+from custom_components.smart_maic.const import (
+    DATA_AGGREGATOR,
+    DEVICE_ID,
+    DEVICE_TYPE,
+    DOMAIN,
+    PREFIX,
+)
+from custom_components.smart_maic.coordinator import SmartMaicCoordinator
+
+from .common import async_setup_integration, device_entry, site_entry, tick
+
+DEVICE_COUNT = 200
+DEVICE_TYPES = ["D101", "D103", "D105"]
+PUBLISH_INTERVAL = 60
+DURATION = 3600
+RELOAD_CYCLES = 3
+
+# NOTE: generous budgets to catch regressions, not to benchmark
+CPU_PER_MESSAGE = 0.01
+# NOTE: per device across traced reloads,
+# a leak of an object per message or of a coordinator per reload exceeds it
+MEMORY_GROWTH = 256
+
+# NOTE: count only memory allocated by the integration itself,
+# deep tracebacks of every allocation are too slow for an hour of payloads
+TRACEBACK_LIMIT = 4
+INTEGRATION_TRACES = [tracemalloc.Filter(True, "*/custom_components/smart_maic/*")]
+
+
+def payload(devtype: str, tick: int) -> dict[str, float]:
+    """Return a JSON payload of a device type at a tick."""
+    if devtype == "D101":
+        return {
+            "V": round(random.uniform(220, 240), 1),
+            "A": round(random.uniform(0, 10), 2),
+            "W": random.randint(0, 2000),
+            "rW": 0,
+            "Wh": 1000 + tick * 30,
+            "rWh": 0,
+            "PF": 0.95,
+            "Temp": 35,
+        }
+    if devtype == "D103":
+        data: dict[str, float] = {"Temp": 40}
+        for index in ["1", "2", "3"]:
+            data |= {
+                f"V{index}": round(random.uniform(220, 240), 1),
+                f"A{index}": round(random.uniform(0, 10), 2),
+                f"W{index}": random.randint(0, 2000),
+                f"rW{index}": 0,
+                f"Wh{index}": 1000 + tick * 30,
+                f"rWh{index}": 0,
+                f"PF{index}": 0.9,
+            }
+        return data
+    return {
+        "Ch1": random.randint(0, 5),
+        "Ch2": random.randint(0, 5),
+        "TCh1": 100 + tick,
+        "TCh2": 200 + tick,
+        "ADC": random.randint(0, 1023),
+        "Temp": 30,
+        "OUT": tick % 2,
+    }
+
+
+def payloads(entries: list[ConfigEntry], tick: int) -> dict[str, dict[str, float]]:
+    """Return JSON payloads of every device by devid."""
+    return {
+        entry.data[DEVICE_ID]: payload(entry.data[DEVICE_TYPE], tick)
+        for entry in entries
+    }
+
+
+def mqtt_subscription_count(hass: HomeAssistant) -> int:
+    """Return the number of MQTT subscriptions of the integration."""
+    client = hass.data["mqtt"].client
+    return sum(
+        len(subscriptions)
+        for topic, subscriptions in client._simple_subscriptions.items()
+        if topic.split("/")[-2].startswith("soak")
+    )
+
+
+def snapshot(mqtt_mock: MqttMockHAClient) -> tracemalloc.Snapshot:
+    """Return a snapshot of memory allocated within the integration."""
+    # NOTE: mocks keep arguments of every call, including subscribed callbacks
+    mqtt_mock.reset_mock()
+    storage.Store._async_load.reset_mock()
+    storage.Store._async_write_data.reset_mock()
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(INTEGRATION_TRACES)
+
+
+async def test_soak(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Run many mixed devices for an hour with reloads and no leaks."""
+    random.seed(0)
+    entries = [
+        device_entry(f"soak{index:03}", DEVICE_TYPES[index % len(DEVICE_TYPES)])
+        for index in range(DEVICE_COUNT)
+    ]
+    site = site_entry()
+    for entry in [*entries, site]:
+        entry.add_to_hass(hass)
+    aggregator = None
+
+    async def run(ticks: range) -> tuple[int, float]:
+        messages = 0
+        started = time.process_time()
+        for index in ticks:
+            for devid, data in payloads(entries, index).items():
+                async_fire_mqtt_message(
+                    hass, f"{PREFIX}/{devid}/JSON", json.dumps(data)
+                )
+                messages += 1
+            tick(hass, freezer, PUBLISH_INTERVAL)
+            await hass.async_block_till_done()
+        return messages, time.process_time() - started
+
+    async def reload(index: int) -> None:
+        for entry in [*entries, site]:
+            assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert_unloaded()
+        await async_setup_integration(hass, freezer, payloads(entries, index))
+
+    def assert_unloaded() -> None:
+        assert mqtt_subscription_count(hass) == 0
+        assert not hass.data[DOMAIN]
+        assert not aggregator._sites
+        for coordinator in coordinators:
+            assert not coordinator._listeners
+            assert not coordinator._subscriptions
+            assert not coordinator._sample_listeners
+            assert not coordinator._tracked_keys
+            assert coordinator._coalesce_unsub is None
+
+    def state() -> dict[str, object]:
+        return {
+            "subscriptions": mqtt_subscription_count(hass),
+            "bus_listeners": hass.bus.async_listeners(),
+            "listeners": [len(coordinator._listeners) for coordinator in coordinators],
+            "sites": list(aggregator._sites),
+            "devices": sorted(aggregator._devices),
+        }
+
+    await async_setup_integration(hass, freezer, payloads(entries, 0))
+    aggregator = hass.data[DATA_AGGREGATOR]
+    coordinators: list[SmartMaicCoordinator] = [
+        hass.data[DOMAIN][entry.entry_id] for entry in entries
+    ]
+    assert mqtt_subscription_count(hass) == 2 * DEVICE_COUNT
+
+    ticks = DURATION // PUBLISH_INTERVAL
+    cycle_ticks = ticks // (2 * (RELOAD_CYCLES + 1))
+    untraced = ticks - cycle_ticks * (RELOAD_CYCLES + 1)
+    messages, cpu = await run(range(1, untraced))
+    assert cpu / messages < CPU_PER_MESSAGE
+
+    # NOTE: trace a first reload as a warm-up,
+    # so objects replacing untraced ones do not count as growth
+    tracemalloc.start(TRACEBACK_LIMIT)
+    snapshots: list[tracemalloc.Snapshot] = []
+    states: list[dict[str, object]] = []
+    for cycle in range(RELOAD_CYCLES + 1):
+        start = untraced + cycle * cycle_ticks
+        await reload(start)
+        coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+        await run(range(start + 1, start + cycle_ticks))
+        snapshots.append(snapshot(mqtt_mock))
+        states.append(state())
+    tracemalloc.stop()
+
+    stats = snapshots[-1].compare_to(snapshots[1], "filename")
+    assert sum(stat.size_diff for stat in stats) < MEMORY_GROWTH * DEVICE_COUNT
+    assert all(state == states[1] for state in states[2:])
+    assert states[-1]["subscriptions"] == 2 * DEVICE_COUNT
+    assert len(states[-1]["devices"]) == DEVICE_COUNT
+    assert hass.states.get("sensor.site_total_power").state not in (
+        "unknown",
+        "unavailable",
+    )
+
+    for entry in [*entries, site]:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert_unloaded()
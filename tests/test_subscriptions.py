@@ -0,0 +1,61 @@
+"""Tests of per-metric MQTT subscriptions."""
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.smart_maic.const import PER_METRIC_TOPICS, PREFIX
+
+from .common import (
+    D101_PAYLOAD,
+    async_setup_integration,
+    device_entry,
+    site_entry,
+    subscribed_topics,
+    tick,
+)
+
+
+def metric_keys(topics: set[str]) -> set[str]:
+    """Return metric keys of prefixed topics."""
+    return {
+        topic.rsplit("/", 1)[-1] for topic in topics if topic.startswith(f"{PREFIX}/")
+    }
+
+
+async def test_per_metric_topics(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Subscribe to enabled metrics and counters, and site metrics with a site."""
+    entry = device_entry("meter", **{PER_METRIC_TOPICS: True})
+    entry.add_to_hass(hass)
+    await async_setup_integration(hass, freezer, {"meter": D101_PAYLOAD})
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+
+    # NOTE: return power and energy entities are disabled by default
+    assert metric_keys(subscribed_topics(hass, "meter")) == {
+        "V",
+        "A",
+        "W",
+        "Wh",
+        "PF",
+        "Temp",
+    }
+
+    site = site_entry()
+    site.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(site.entry_id)
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+
+    assert "rW" in metric_keys(subscribed_topics(hass, "meter"))
+
+    assert await hass.config_entries.async_unload(site.entry_id)
+    tick(hass, freezer, 2)
+    await hass.async_block_till_done()
+
+    assert "rW" not in metric_keys(subscribed_topics(hass, "meter"))